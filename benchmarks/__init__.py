@@ -0,0 +1 @@
+"""Standalone measurement scripts, run with `python -m benchmarks.<name>`."""
@@ -0,0 +1,221 @@
+"""Simulate browser clients polling the world and watch the ticks slip.
+
+    python -m benchmarks.loadtest --clients 50 --rate 2 --duration 30
+    gunicorn -w 4 main:app & python -m benchmarks.loadtest --url http://127.0.0.1:8000 --clients 200
+
+Every client loads the /world page once, as a browser would: the HTML, its
+stylesheet and script modules, and the heightmap from /api/terrain. Then it
+polls /api/world with `since` at --rate requests per second, as the page
+script does. Requests go over real HTTP: to an in-process threaded server by
+default, or to --url for a local gunicorn. The report gives latency
+percentiles and throughput for each route, and the intervals between world
+ticks, which should stay at the world's update interval. In-process only the
+update thread ticks (requests just mark the world as read), and its ticks
+and passes are timed on the world itself, so contention between the request
+threads and the update thread shows up directly. Against --url the ticks
+are inferred from the update_count each poll sees, which is only as precise
+as the polling.
+"""
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+ROUTES = ("/world", "/api/terrain", "/static", "/api/world")
+PAGE_ASSET = re.compile(r'(?:src|href)="(/static/[^"]+)"')
+MODULE_IMPORT = re.compile(r"""from\s+['"](\.{1,2}/[^'"]+)['"]""")
+PAGE_SEED = re.compile(r"const worldSeed = (\d+);")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Results:
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.tick_times: List[float] = []  # When each new tick was first observed
+        self._last_tick = -1
+        self._lock = threading.Lock()
+
+    def record(self, route: str, seconds: Optional[float]) -> None:
+        with self._lock:
+            if seconds is None:
+                self.errors[route] += 1
+            else:
+                self.latencies[route].append(seconds)
+
+    def saw_tick(self, tick: int, at: float) -> None:
+        with self._lock:
+            if tick > self._last_tick:
+                self._last_tick = tick
+                self.tick_times.append(at)
+
+
+def fetch(url: str, timeout: float) -> Optional[bytes]:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.read()
+    except (urllib.error.URLError, OSError):
+        return None
+
+
+def timed_fetch(url: str, route: str, results: Results) -> Optional[bytes]:
+    start = time.perf_counter()
+    body = fetch(url, 10)
+    results.record(route, time.perf_counter() - start if body is not None else None)
+    return body
+
+
+def load_page(base: str, results: Results) -> None:
+    """Fetch /world and what it loads: stylesheet, script modules and the heightmap."""
+    page = timed_fetch(f"{base}/world", "/world", results)
+    if page is None:
+        return
+    html = page.decode()
+    pending = [base + path for path in PAGE_ASSET.findall(html)]
+    seen = set(pending)
+    while pending:
+        url = pending.pop()
+        body = timed_fetch(url, "/static", results)
+        if body is not None and urllib.parse.urlsplit(url).path.endswith(".js"):
+            for module in MODULE_IMPORT.findall(body.decode()):
+                imported = urllib.parse.urljoin(url, module)
+                if imported not in seen:
+                    seen.add(imported)
+                    pending.append(imported)
+    seed = PAGE_SEED.search(html)
+    if seed is not None:
+        timed_fetch(f"{base}/api/terrain?seed={seed.group(1)}&format=u16", "/api/terrain", results)
+
+
+def client(base: str, rate: float, deadline: float, results: Results, observe_ticks: bool) -> None:
+    load_page(base, results)
+
+    since = None
+    interval = 1 / rate
+    next_poll = time.perf_counter() + random.uniform(0, interval)  # Don't poll in lockstep
+    while next_poll < deadline:
+        time.sleep(max(0.0, next_poll - time.perf_counter()))
+        url = f"{base}/api/world" if since is None else f"{base}/api/world?since={since}"
+        start = time.perf_counter()
+        body = fetch(url, 10)
+        finished = time.perf_counter()
+        results.record("/api/world", finished - start if body is not None else None)
+        if body is not None:
+            since = json.loads(body).get("update_count", since)
+            if observe_ticks and since is not None:
+                results.saw_tick(since, finished)
+        next_poll += interval
+
+
+def serve_in_process():
+    """Start the app on a free local port; returns its base URL, world and server.
+
+    Requests only mark the world as read instead of ticking it themselves, so
+    every tick comes from the update thread and the timings below are its own.
+    """
+    from werkzeug.serving import make_server
+    from main import app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)  # No line per request
+    world = app.world  # Build it, and start its update thread, before timing anything
+    world.update = world.touch
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", world, server
+
+
+def time_update_passes(world, ticks: List[float], passes: List[float]) -> None:
+    """Record when the update thread ticks and how long each of its passes takes."""
+    advance = world.advance
+
+    def timed_advance(budget=None):
+        start = time.perf_counter()
+        count = world.update_count
+        advance(budget)
+        if world.update_count != count:
+            ticks.append(start)
+            passes.append(time.perf_counter() - start)
+
+    world.advance = timed_advance
+
+
+def report(results: Results, elapsed: float, tick_times: List[float], update_interval: float,
+           passes: Optional[List[float]] = None) -> None:
+    print(f"{'route':<12} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for route in ROUTES:
+        latencies = results.latencies[route]
+        print(f"{route:<12} {len(latencies):>9} {results.errors[route]:>7} {len(latencies) / elapsed:>8.1f} "
+              + " ".join(f"{percentile(latencies, q) * 1000:>8.1f}" for q in (0.5, 0.95, 0.99)))
+
+    intervals = [later - earlier for earlier, later in zip(tick_times, tick_times[1:])]
+    if not intervals:
+        print("No tick intervals observed")
+        return
+    late = [interval - update_interval for interval in intervals]
+    print(f"{len(intervals)} tick intervals, nominal {update_interval:.2f}s: "
+          f"p50 {percentile(intervals, 0.5):.3f}s, p95 {percentile(intervals, 0.95):.3f}s, max {max(intervals):.3f}s")
+    print(f"  late by p50 {percentile(late, 0.5) * 1000:.0f} ms, p95 {percentile(late, 0.95) * 1000:.0f} ms, "
+          f"max {max(late) * 1000:.0f} ms")
+    if passes:
+        print(f"  update passes p50 {percentile(passes, 0.5) * 1000:.1f} ms, "
+              f"p95 {percentile(passes, 0.95) * 1000:.1f} ms, max {max(passes) * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running server; default is an in-process one")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=1.0, help="polls per second per client")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of polling")
+    parser.add_argument("--update-interval", type=float, default=1.0, help="tick interval of the --url server")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    world = server = None
+    passes: List[float] = []
+    if args.url:
+        base = args.url.rstrip("/")
+        update_interval = args.update_interval
+    else:
+        base, world, server = serve_in_process()
+        update_interval = world.update_interval
+        ticks: List[float] = []
+        time_update_passes(world, ticks, passes)
+
+    results = Results()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(target=client, args=(base, args.rate, deadline, results, world is None), daemon=True)
+        for _ in range(args.clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.clients} clients at {args.rate:g}/s for {elapsed:.1f}s against {base}")
+    report(results, elapsed, results.tick_times if world is None else ticks, update_interval, passes)
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Report bytes per entity for growing populations.
+
+    python -m benchmarks.memory --sizes 10000 100000 1000000
+
+The population mixes dragons, caravans, bandits, spirits and villages in
+fixed proportions. tracemalloc counts everything the entities allocate,
+including their attribute storage and containers.
+"""
+import argparse
+import gc
+import tracemalloc
+
+from entities import Bandit, Caravan, Dragon, Spirit, Village
+
+DRAGON_KINDS = [["serpent", "aquatic"], ["brute", "mountain"], ["blade", "verdant"], ["druid", "flame"], ["midas", "mountain"]]
+
+
+def make_entity(i: int, home: Village):
+    kind = i % 10
+    coordinates = (i % 200, (i // 200) % 200)
+    if kind < 4:
+        return Spirit("forest", coordinates, 40, 12)
+    if kind < 6:
+        dragon = Dragon(f"D{i}", DRAGON_KINDS[i % len(DRAGON_KINDS)], coordinates)
+        dragon.target = home
+        return dragon
+    if kind < 8:
+        caravan = Caravan(coordinates, home, "trade")
+        caravan.home = home
+        return caravan
+    if kind < 9:
+        return Bandit(coordinates)
+    return Village(f"V{i}", coordinates)
+
+
+def measure(size: int) -> float:
+    home = Village("Home", (100, 100))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [make_entity(i, home) for i in range(size)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entities
+    return (after - before) / size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'entities':>10} {'bytes/entity':>13}")
+    for size in args.sizes:
+        print(f"{size:>10} {measure(size):>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
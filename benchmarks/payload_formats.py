@@ -0,0 +1,60 @@
+"""Compare /api/world keyframe encodings by size and server encode time.
+
+    python -m benchmarks.payload_formats --seed 1 --dragons 0 500 5000
+"""
+import argparse
+import gzip
+import json
+import time
+
+from endpoints.columnar import columnar_payload
+from entities import Dragon
+from world import World
+
+DRAGON_KINDS = [["serpent", "aquatic"], ["brute", "mountain"], ["blade", "verdant"], ["druid", "flame"], ["midas", "mountain"]]
+
+
+def timed(encode, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = encode()
+    return body, (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dragons", type=int, nargs="+", default=[0, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'dragons':>8} {'entities':>8} {'format':<18} {'bytes':>10} {'gzip':>9} {'encode ms':>10}")
+    for count in args.dragons:
+        world = World(seed=args.seed)
+        spirits = list(world.entities)
+        for i in range(count):
+            dragon = Dragon(f"D{i}", DRAGON_KINDS[i % len(DRAGON_KINDS)], (i % world.WIDTH, (i * 7) % world.HEIGHT))
+            dragon.target = spirits[i % len(spirits)]
+            world.add_entity(dragon)
+
+        encodings = {
+            # Objects with debug strings, as every request used to send
+            "json+debug": lambda: json.dumps(
+                [dict(e.serialize(), debug_info=e.describe()) for e in world.entities],
+                separators=(",", ":"),
+            ).encode(),
+            "json": lambda: json.dumps(
+                [e.serialize() for e in world.entities], separators=(",", ":")
+            ).encode(),
+            "columnar": lambda: json.dumps(
+                columnar_payload({"entities": [e.serialize() for e in world.entities]}, world.WIDTH),
+                separators=(",", ":"),
+            ).encode(),
+        }
+        for name, encode in encodings.items():
+            body, ms = timed(encode, args.repeat)
+            print(f"{count:>8} {len(world.entities):>8} {name:<18} {len(body):>10} {len(gzip.compress(body)):>9} {ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
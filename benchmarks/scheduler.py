@@ -0,0 +1,76 @@
+"""Time the scheduler against updating every entity.
+
+    python -m benchmarks.scheduler --seed 1 --ticks 300 --dragons 200 --catch-up 1000
+
+Two identical worlds run side by side, one with World.scheduled off. Spirits
+are drained at random ticks so woken entities are exercised too. Then the
+scheduled world fast-forwards --catch-up ticks in one go while the other
+steps them. That the two stay identical is checked by
+tests/test_scheduler.py.
+"""
+import argparse
+import random
+import time
+
+from entities import Dragon, Spirit
+from world.demo import build_demo_world
+
+DRAGON_KINDS = [["serpent", "aquatic"], ["brute", "mountain"], ["blade", "verdant"], ["druid", "flame"], ["midas", "mountain"]]
+
+
+def build(seed: int, dragons: int, scheduled: bool):
+    world = build_demo_world(seed)
+    world.scheduled = scheduled
+    spirits = [entity for entity in world.entities if isinstance(entity, Spirit)]
+    for i in range(dragons):
+        dragon = Dragon(f"D{i}", DRAGON_KINDS[i % len(DRAGON_KINDS)], (i % world.WIDTH, (i * 7) % world.HEIGHT))
+        dragon.target = spirits[i % len(spirits)]
+        dragon.state = "moving"
+        world.add_entity(dragon)
+    world.get_changes()
+    return world, spirits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--dragons", type=int, default=200)
+    parser.add_argument("--catch-up", type=int, default=1000)
+    args = parser.parse_args()
+
+    runs = {scheduled: build(args.seed, args.dragons, scheduled) for scheduled in (True, False)}
+    elapsed = {True: 0.0, False: 0.0}
+    events = random.Random(args.seed)
+
+    for _ in range(args.ticks):
+        drain = events.random() < 0.2
+        index = events.randrange(len(runs[True][1]))
+        for scheduled, (world, spirits) in runs.items():
+            if drain:
+                spirits[index].life_depletion_on_use(5)
+            start = time.perf_counter()
+            world.tick()
+            elapsed[scheduled] += time.perf_counter() - start
+
+    entities = len(runs[True][0].entities)
+    print(f"{args.ticks} ticks, {entities} entities")
+    for scheduled, label in ((False, "every entity"), (True, "scheduled")):
+        print(f"  {label:<13} {elapsed[scheduled] / args.ticks * 1000:8.3f} ms/tick")
+
+    if args.catch_up:
+        start = time.perf_counter()
+        for _ in range(args.catch_up):
+            runs[False][0].tick()
+        stepped = time.perf_counter() - start
+        start = time.perf_counter()
+        runs[True][0].fast_forward(args.catch_up)
+        forwarded = time.perf_counter() - start
+
+        print(f"{args.catch_up} missed ticks")
+        print(f"  {'stepped':<13} {stepped * 1000:8.1f} ms")
+        print(f"  {'fast-forward':<13} {forwarded * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
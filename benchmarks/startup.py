@@ -0,0 +1,62 @@
+"""Time a cold start from `import main` to the first responses.
+
+    python -m benchmarks.startup [--snapshot prebaked/world.pickle] [--runs 5]
+
+Each run is a fresh interpreter, so module imports and world construction
+are paid in full, as on a serverless cold start.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+client = main.app.test_client()
+client.get("/notes")
+notes = time.perf_counter()
+client.get("/api/world")
+world = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "first /notes": notes - start,
+    "first /api/world": world - start,
+}))
+"""
+
+
+def run_once(env) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        capture_output=True, text=True, check=True, env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold start latency.")
+    parser.add_argument("--snapshot", help="prebaked world to load via WORLD_SNAPSHOT")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.pop("WORLD_SNAPSHOT", None)
+    if args.snapshot:
+        env["WORLD_SNAPSHOT"] = args.snapshot
+
+    runs = [run_once(env) for _ in range(args.runs)]
+    label = f"snapshot {args.snapshot}" if args.snapshot else "generated world"
+    print(f"{label}, {args.runs} runs (median / max seconds)")
+    for phase in runs[0]:
+        values = [run[phase] for run in runs]
+        print(f"  {phase:<18} {statistics.median(values):.3f} / {max(values):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
 from .api import api_bp
 from .endpoints import endpoints_bp
+from .recordings import recordings_bp
+from .compression import init_compression
+from .memory import init_memory_debug
+from .metrics import init_metrics
+from .static_assets import init_static_assets
 
-__all__ = ["api_bp", "endpoints_bp"]
+__all__ = ["api_bp", "endpoints_bp", "recordings_bp", "init_compression", "init_memory_debug", "init_metrics", "init_static_assets"]
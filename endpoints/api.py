@@ -1,8 +1,73 @@
-from flask import Blueprint, jsonify, current_app
-import time
+import math
+
+from flask import Blueprint, Response, abort, jsonify, current_app, make_response, request, stream_with_context
+from entities.base.settlement import Settlement
+from endpoints.broadcast import get_broadcaster
+from endpoints.columnar import columnar_payload
+from endpoints.compression import choose_encoding
+from endpoints.response_cache import CachedPayload, get_response_cache
+from world.spatial import expand
+from world.stats import RESOLUTIONS, SERIES, get_stats
+from world.terrain_stats import SITE_PROFILES
+from world.terrain_codec import BIOMES, FORMATS, clamp_region, encode_cells, encode_terrain
 
 
 api_bp = Blueprint("api", __name__)
+terrain_responses = {}  # (seed, format, region) -> CachedPayload
+MAX_MARGIN = 64  # Tiles a viewport may be widened by
+
+
+def hosted_world(world_id):
+    """The site's world, or the hosted world `world_id` under /api/world/<world_id>/..."""
+    if world_id is None:
+        return current_app.world
+    world = current_app.worlds.get(world_id)
+    if world is None:
+        abort(make_response(jsonify({"error": f"Invalid world id {world_id!r}, or no room for another world"}), 404))
+    return world
+
+
+def parse_viewport(args, world):
+    """Read `viewport=x0,y0,x1,y1` and `margin=n` query parameters into bounds.
+
+    The margin is capped at MAX_MARGIN and the result clipped to the map; a
+    viewport entirely off the map is a 400.
+    """
+    viewport = args.get("viewport")
+    if not viewport:
+        return None
+    try:
+        x0, y0, x1, y1 = (int(edge) for edge in viewport.split(","))
+    except ValueError:
+        return None
+    margin = min(MAX_MARGIN, max(0, args.get("margin", default=0, type=int)))
+    x0, y0, x1, y1 = expand((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)), margin)
+    x0, y0 = max(0, x0), max(0, y0)
+    x1, y1 = min(world.WIDTH - 1, x1), min(world.HEIGHT - 1, y1)
+    if x0 > x1 or y0 > y1:
+        abort(make_response(jsonify({"error": f"Viewport {viewport} does not overlap the map"}), 400))
+    return (x0, y0, x1, y1)
+
+
+def cached_response(cached: CachedPayload, mimetype: str, cache_control: str) -> Response:
+    """Answer with a shared payload: 304 on a matching ETag, otherwise the best encoding."""
+    if request.if_none_match.contains(cached.etag):
+        response = Response(status=304)
+    else:
+        encoding, body = cached.encoded(choose_encoding(request))
+        response = Response(body, mimetype=mimetype)
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+    
+    response.set_etag(cached.etag)
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+def parse_format(args) -> str:
+    """Entity list encoding: plain `json` objects or `columnar` arrays."""
+    return "columnar" if args.get("format") == "columnar" else "json"
 
 
 @api_bp.get("/api/data")
@@ -34,17 +99,269 @@ def get_item(item_id: int):
     )
 
 
-@api_bp.get("/api/world")
-def get_world():
-    """Get current world state including all entities."""
-    world = current_app.world
+@api_bp.get("/api/world", defaults={"world_id": None})
+@api_bp.get("/api/world/<world_id>")
+def get_world(world_id):
+    """Get current world state including all entities.
+
+    Clients may pass `since=<update_count>` to receive only the entities added,
+    changed or removed after that tick; a full keyframe is returned when the
+    tick is no longer in the change history. `viewport=x0,y0,x1,y1` and
+    `margin=n` restrict the answer to entities whose tiles intersect that
+    rectangle. `format=columnar` selects the compact columnar encoding and
+    `debug=1` adds each entity's debug line. The encoded body is shared by all
+    requests for the same tick and revalidates with an ETag.
+    """
+    world = hosted_world(world_id)
     
     # Force update check
     world.update()
     
+    since = request.args.get("since", type=int)
+    viewport = parse_viewport(request.args, world)
+    fmt = parse_format(request.args)
+    
+    if request.args.get("debug"):
+        # Debug lines are built from live entities, so they bypass the shared cache
+        payload = world.get_changes().keyframe(viewport)
+        payload["entities"] = [
+            dict(data, debug_info=world.entities_by_id[data["id"]].describe())
+            for data in payload["entities"] if data["id"] in world.entities_by_id
+        ]
+        if fmt == "columnar":
+            payload = columnar_payload(payload, world.WIDTH)
+        return jsonify(payload)
+    
+    cached = get_response_cache(world).get(world, since, viewport, fmt)
+    
+    response = cached_response(cached, "application/json", "no-cache")
+    response.headers["X-Next-Update-In"] = f"{world.get_next_update_time():.3f}"
+    return response
+
+
+@api_bp.get("/api/entity/<int:entity_id>", defaults={"world_id": None})
+@api_bp.get("/api/world/<world_id>/entity/<int:entity_id>")
+def get_entity(world_id, entity_id: int):
+    """Get one live entity with its debug line."""
+    world = hosted_world(world_id)
+    entity = world.entities_by_id.get(entity_id)
+    if entity is not None:
+        return jsonify(dict(entity.serialize(), debug_info=entity.describe()))
+    # Shared-memory workers only hold the published state, without debug lines
+    data = world.get_changes().state.get(entity_id)
+    if data is None:
+        return jsonify({"error": f"No entity {entity_id}"}), 404
+    return jsonify(data)
+
+
+@api_bp.get("/api/stats", defaults={"world_id": None})
+@api_bp.get("/api/world/<world_id>/stats")
+def get_world_stats(world_id):
+    """World statistics over time, for charts.
+
+    `resolution` is `tick`, `minute` (default) or `hour`; `from` and `to` are
+    Unix times bounding the bucket start times, and `series` a comma-separated
+    subset of SERIES. Each series has `mean`, `min` and `max` arrays aligned
+    with `times`; the last bucket may still be filling. Hosted worlds collect
+    from their first query on. In shared mode the simulator publishes no
+    statistics, so this answers 404.
+    """
+    world = hosted_world(world_id)
+    stats = get_stats(world)
+    if stats is None:
+        return jsonify({"error": "Statistics are collected by the simulator process"}), 404
+    
+    resolution = request.args.get("resolution", "minute")
+    if resolution not in RESOLUTIONS:
+        return jsonify({"error": f"Unknown resolution {resolution!r}", "resolutions": list(RESOLUTIONS)}), 400
+    series = request.args.get("series")
+    series = series.split(",") if series else list(SERIES)
+    unknown = [name for name in series if name not in SERIES]
+    if unknown:
+        return jsonify({"error": f"Unknown series {unknown}", "series": list(SERIES)}), 400
+    
+    start = request.args.get("from", default=float("-inf"), type=float)
+    end = request.args.get("to", default=float("inf"), type=float)
+    return jsonify(stats.query(resolution, start, end, series))
+
+
+@api_bp.get("/api/sites", defaults={"world_id": None})
+@api_bp.get("/api/world/<world_id>/sites")
+def get_sites(world_id):
+    """Rank open field tiles as sites for a new settlement.
+
+    `kind` (camp, village or city) picks the radius and each biome's weight
+    and wanted share (see SITE_PROFILES). `radius` and `<biome>=<weight>` or
+    `<biome>=<weight>,<share>` parameters override them. `limit` sites are
+    returned best first, each at least `spacing` tiles from the others and
+    from existing settlements, with the biome counts in its radius.
+    """
+    world = hosted_world(world_id)
+    if not hasattr(world, "get_terrain_stats"):
+        return jsonify({"error": "Site scoring needs the simulating process"}), 404
+    kind = request.args.get("kind", "village")
+    if kind not in SITE_PROFILES:
+        return jsonify({"error": f"Unknown kind {kind!r}", "kinds": list(SITE_PROFILES)}), 400
+    radius, profile = SITE_PROFILES[kind]
+    radius = min(50, max(1, request.args.get("radius", default=radius, type=int)))
+    profile = dict(profile)
+    for biome in BIOMES:
+        if biome not in request.args:
+            continue
+        try:
+            weight, _, share = request.args[biome].partition(",")
+            profile[biome] = (float(weight), float(share) if share else profile.get(biome, (0, 0.25))[1])
+        except ValueError:
+            return jsonify({"error": f"Expected {biome}=<weight>[,<share>]"}), 400
+        if not math.isfinite(profile[biome][0]):
+            return jsonify({"error": f"The weight of {biome} must be a finite number"}), 400
+        if not 0 < profile[biome][1] <= 1:
+            return jsonify({"error": f"The share of {biome} must be in (0, 1]"}), 400
+    limit = min(100, max(1, request.args.get("limit", default=10, type=int)))
+    spacing = max(0, request.args.get("spacing", default=2 * radius, type=int))
+    
+    terrain = world.get_terrain_stats()
+    settlements = [entity.coordinates for entity in list(world.entities) if isinstance(entity, Settlement)]
+    sites = terrain.score_sites(profile, radius, limit, spacing, allowed=world.is_open, taken=settlements)
     return jsonify({
-        "entities": [entity.serialize() for entity in world.entities],
-        "update_count": world.update_count,
-        "timestamp": time.time(),
-        "next_update_in": world.get_next_update_time(),
+        "kind": kind,
+        "radius": radius,
+        "profile": {biome: {"weight": weight, "share": share} for biome, (weight, share) in profile.items()},
+        "sites": [
+            {"coordinates": site.coordinates, "score": site.score, "counts": terrain.counts(site.coordinates, radius)}
+            for site in sites
+        ],
     })
+
+
+@api_bp.get("/api/terrain", defaults={"world_id": None})
+@api_bp.get("/api/world/<world_id>/terrain")
+def get_terrain(world_id):
+    """Serve the heightmap as quantized binary samples.
+
+    `format` is `u16` (default), `u8` or `biome` (one code per tile, see
+    BIOMES); `x`, `y`, `w` and `h` select a chunk. Samples are row-major and
+    little-endian, with the region described in X-Terrain-* headers. Terrain
+    never changes for a seed, so requests naming the world's `seed` are
+    cacheable forever.
+    """
+    world = hosted_world(world_id)
+    fmt = request.args.get("format", "u16")
+    if fmt not in FORMATS:
+        return jsonify({"error": f"Unknown terrain format {fmt!r}", "formats": list(FORMATS)}), 400
+    
+    requested = [request.args.get(name, type=int) for name in ("x", "y", "w", "h")]
+    region = clamp_region(
+        tuple(requested) if None not in requested else None,
+        world.WIDTH,
+        world.HEIGHT,
+    )
+    
+    key = (world.seed, fmt, region)
+    cached = terrain_responses.get(key)
+    if cached is None:
+        if len(terrain_responses) >= 256:
+            terrain_responses.clear()
+        etag = f"t{world.seed}-{fmt}-" + ".".join(str(edge) for edge in region)
+        cached = terrain_responses[key] = CachedPayload(etag, encode_terrain(world, fmt, region))
+    
+    if request.args.get("seed", type=int) == world.seed:
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        cache_control = "no-cache"
+    
+    response = cached_response(cached, "application/octet-stream", cache_control)
+    response.headers["X-Terrain-Format"] = fmt
+    response.headers["X-Terrain-Region"] = ",".join(str(edge) for edge in region)
+    response.headers["X-Terrain-Map-Size"] = f"{world.WIDTH},{world.HEIGHT}"
+    return response
+
+
+@api_bp.get("/api/terrain/lod", defaults={"world_id": None})
+@api_bp.get("/api/world/<world_id>/terrain/lod")
+def get_terrain_lod(world_id):
+    """Serve one level of the terrain pyramid, for zoomed-out views.
+
+    `level` picks the level directly (0 is full resolution, each level
+    halves the map); otherwise `scale`, the tiles one screen cell will show,
+    picks the coarsest level that is still fine enough. `x`, `y`, `w` and `h`
+    select a region in tiles, which is widened to whole cells. Formats are
+    those of /api/terrain, with `biome` giving each cell's dominant biome.
+    X-Terrain-Region and X-Terrain-Map-Size are in cells of the level, and
+    X-Terrain-Cell is the tiles per cell side.
+    """
+    world = hosted_world(world_id)
+    if not hasattr(world, "get_terrain_pyramid"):
+        return jsonify({"error": "Terrain levels need the simulating process"}), 404
+    fmt = request.args.get("format", "biome")
+    if fmt not in FORMATS:
+        return jsonify({"error": f"Unknown terrain format {fmt!r}", "formats": list(FORMATS)}), 400
+    
+    pyramid = world.get_terrain_pyramid()
+    level = request.args.get("level", type=int)
+    if level is None:
+        level = pyramid.level_for(max(1.0, request.args.get("scale", default=1.0, type=float)))
+    level = min(max(0, level), len(pyramid.levels) - 1)
+    cells = pyramid.levels[level]
+    
+    requested = [request.args.get(name, type=int) for name in ("x", "y", "w", "h")]
+    tiles = clamp_region(tuple(requested) if None not in requested else None, world.WIDTH, world.HEIGHT)
+    region = pyramid.region(level, tiles)
+    
+    key = (world.seed, fmt, region, level)
+    cached = terrain_responses.get(key)
+    if cached is None:
+        if len(terrain_responses) >= 256:
+            terrain_responses.clear()
+        etag = f"t{world.seed}-{fmt}-L{level}-" + ".".join(str(edge) for edge in region)
+        payload = encode_cells(cells.heights, cells.biomes, cells.width, fmt, region)
+        cached = terrain_responses[key] = CachedPayload(etag, payload)
+    
+    if request.args.get("seed", type=int) == world.seed:
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        cache_control = "no-cache"
+    
+    response = cached_response(cached, "application/octet-stream", cache_control)
+    response.headers["X-Terrain-Format"] = fmt
+    response.headers["X-Terrain-Level"] = str(level)
+    response.headers["X-Terrain-Cell"] = str(cells.cell)
+    response.headers["X-Terrain-Region"] = ",".join(str(edge) for edge in region)
+    response.headers["X-Terrain-Map-Size"] = f"{cells.width},{cells.height}"
+    return response
+
+
+@api_bp.get("/api/world/stream", defaults={"world_id": None})
+@api_bp.get("/api/world/<world_id>/stream")
+def stream_world(world_id):
+    """Push every world tick to the client as server-sent events.
+
+    The first event is a keyframe, later events are deltas in the same format
+    as `/api/world?since=`, and the same viewport and format parameters
+    apply. Each connection holds a worker thread, so run gunicorn with a
+    threaded worker class when many viewers are expected.
+    """
+    world = hosted_world(world_id)
+    world.update()  # Resumes a suspended world before the first keyframe
+    broadcaster = get_broadcaster(world)
+    viewport = parse_viewport(request.args, world)
+    fmt = parse_format(request.args)
+    
+    def events():
+        subscription = broadcaster.subscribe(viewport, fmt)
+        try:
+            while True:
+                world.touch()  # An open stream is a reader, so keep the world awake
+                frame = broadcaster.next_frame(subscription, timeout=15)
+                if broadcaster.closed:
+                    return  # World unloaded; EventSource reconnects and reloads it
+                # Comment lines keep proxies from closing an idle connection
+                yield frame if frame is not None else b": keepalive\n\n"
+        finally:
+            broadcaster.unsubscribe(subscription)
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
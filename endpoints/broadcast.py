@@ -0,0 +1,127 @@
+"""Server-sent event fan-out of world ticks."""
+import json
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from endpoints.columnar import columnar_payload
+from world.spatial import Bounds
+
+
+class Subscription:
+    """Frames queued for one connected client."""
+
+    def __init__(self, viewport: Optional[Bounds] = None, fmt: str = "json"):
+        self.viewport = viewport
+        self.format = fmt
+        self.frames: deque = deque()
+        self.queued_bytes = 0
+        self.needs_keyframe = True  # First frame is always a keyframe
+
+
+class TickBroadcaster:
+    """Encodes each tick once and hands the same bytes to every subscriber.
+
+    Subscribers watching the same viewport in the same format share one
+    encoded frame per tick.
+    A subscriber that falls more than `max_frames` frames or `max_bytes` bytes
+    behind has its queue dropped and is resynchronised with a keyframe, so a
+    slow consumer never holds more than that much memory.
+    """
+
+    def __init__(self, world, max_frames: int = 32, max_bytes: int = 1 << 20):
+        self.world = world
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self._cond = threading.Condition()
+        self._subscribers = set()
+        self._last_tick: Optional[int] = world.get_changes().tick
+        self.closed = False  # Set when the world is unloaded; streams end
+        self._keyframes: Dict[Tuple[Optional[Bounds], str], Tuple[int, bytes]] = {}
+
+    def encode(self, payload, fmt: str) -> bytes:
+        if fmt == "columnar":
+            payload = columnar_payload(payload, self.world.WIDTH)
+        return b"data: " + json.dumps(payload, separators=(",", ":")).encode() + b"\n\n"
+
+    def publish(self, world) -> None:
+        """Tick listener: encode the latest change and queue it for every subscriber."""
+        changes = world.changes
+        since, self._last_tick = self._last_tick, changes.tick
+        if not self._subscribers or since is None:
+            return
+
+        frames: Dict[Tuple[Optional[Bounds], str], bytes] = {}
+        with self._cond:
+            for subscription in self._subscribers:
+                if subscription.needs_keyframe:
+                    continue
+                key = (subscription.viewport, subscription.format)
+                frame = frames.get(key)
+                if frame is None:
+                    payload = changes.delta(since, key[0]) or changes.keyframe(key[0])
+                    frame = frames[key] = self.encode(payload, key[1])
+                if (len(subscription.frames) >= self.max_frames
+                        or subscription.queued_bytes + len(frame) > self.max_bytes):
+                    subscription.frames.clear()
+                    subscription.queued_bytes = 0
+                    subscription.needs_keyframe = True
+                    continue
+                subscription.frames.append(frame)
+                subscription.queued_bytes += len(frame)
+            self._cond.notify_all()
+
+    def keyframe_frame(self, viewport: Optional[Bounds] = None, fmt: str = "json") -> bytes:
+        """Encoded keyframe of the latest tick, built at most once per tick, viewport and format."""
+        changes = self.world.get_changes()
+        tick, frame = self._keyframes.get((viewport, fmt), (None, b""))
+        if tick != changes.tick:
+            frame = self.encode(changes.keyframe(viewport), fmt)
+            if len(self._keyframes) >= 64:
+                self._keyframes.clear()
+            self._keyframes[(viewport, fmt)] = (changes.tick, frame)
+        return frame
+
+    def subscribe(self, viewport: Optional[Bounds] = None, fmt: str = "json") -> Subscription:
+        subscription = Subscription(viewport, fmt)
+        with self._cond:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._cond:
+            self._subscribers.discard(subscription)
+
+    def close(self) -> None:
+        """Wake every subscriber so its stream ends, e.g. when the world is unloaded."""
+        with self._cond:
+            self.closed = True
+            self._subscribers.clear()
+            self._cond.notify_all()
+
+    def next_frame(self, subscription: Subscription, timeout: float) -> Optional[bytes]:
+        """Block until a frame is available; None on timeout or once closed."""
+        with self._cond:
+            ready = lambda: self.closed or subscription.frames or subscription.needs_keyframe
+            if not self._cond.wait_for(ready, timeout) or self.closed:
+                return None
+            if not subscription.needs_keyframe:
+                frame = subscription.frames.popleft()
+                subscription.queued_bytes -= len(frame)
+                return frame
+            subscription.needs_keyframe = False
+        return self.keyframe_frame(subscription.viewport, subscription.format)
+
+
+_lock = threading.Lock()
+
+
+def get_broadcaster(world) -> TickBroadcaster:
+    """Get the world's broadcaster, registering it as a tick listener on first use."""
+    with _lock:
+        broadcaster = getattr(world, "broadcaster", None)
+        if broadcaster is None:
+            broadcaster = TickBroadcaster(world)
+            world.broadcaster = broadcaster
+            world.tick_listeners.append(broadcaster.publish)
+        return broadcaster
@@ -0,0 +1,80 @@
+"""Columnar wire format for entity lists.
+
+Instead of one dict per entity, every field becomes one array indexed by
+entity position. String fields are dictionary-coded (the distinct values are
+sent once per payload), coordinates are packed as `y * width + x`, and
+settlement tiles are flattened to `[position, character, color, ...]` using
+the same dictionaries. Missing fields are `null`. The decoder lives in
+`static/world/entities.js`.
+"""
+from typing import Any, Dict, List
+
+
+class _Dictionary:
+    """Assigns small integer codes to strings in first-seen order."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def encode_columns(entities: List[Dict[str, Any]], width: int) -> Dict[str, Any]:
+    """Convert a list of serialized entities into a columnar block."""
+    fields: Dict[str, None] = {}
+    for entity in entities:
+        fields.update(dict.fromkeys(entity))
+
+    dictionaries: Dict[str, _Dictionary] = {}
+
+    def dictionary(field: str) -> _Dictionary:
+        if field not in dictionaries:
+            dictionaries[field] = _Dictionary()
+        return dictionaries[field]
+
+    columns: Dict[str, List[Any]] = {}
+    for field in fields:
+        values = [entity.get(field) for entity in entities]
+
+        if field == "coordinates":
+            columns["position"] = [None if v is None else v[1] * width + v[0] for v in values]
+        elif field == "domain_tiles":
+            columns[field] = [None if v is None else [y * width + x for x, y in v] for v in values]
+        elif field == "tiles":
+            characters, colors = dictionary("character"), dictionary("color")
+            column = []
+            for tiles in values:
+                if tiles is None:
+                    column.append(None)
+                    continue
+                flat = []
+                for (x, y), character, color in tiles:
+                    flat.extend((y * width + x, characters.code(character), colors.code(color)))
+                column.append(flat)
+            columns[field] = column
+        elif any(isinstance(v, str) for v in values) and all(v is None or isinstance(v, str) for v in values):
+            codes = dictionary(field)
+            columns[field] = [None if v is None else codes.code(v) for v in values]
+        else:
+            columns[field] = values
+
+    return {
+        "count": len(entities),
+        "dictionaries": {field: codes.values for field, codes in dictionaries.items()},
+        "columns": columns,
+    }
+
+
+def columnar_payload(payload: Dict[str, Any], width: int) -> Dict[str, Any]:
+    """Rewrite the entity lists of a keyframe or delta payload in columnar form."""
+    encoded = dict(payload, format="columnar", width=width)
+    for key in ("entities", "added", "changed"):
+        if key in encoded:
+            encoded[key] = encode_columns(encoded[key], width)
+    return encoded
@@ -0,0 +1,106 @@
+"""Content-encoding helpers shared by cached and dynamic responses."""
+import gzip
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=6),
+}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda data: brotli.compress(data, quality=5)
+
+# Preferred first when the client accepts several
+PREFERENCE = ("br", "gzip")
+
+
+def choose_encoding(request) -> Optional[str]:
+    """Pick the best supported encoding the client accepts, or None for identity."""
+    for encoding in PREFERENCE:
+        if encoding in COMPRESSORS and request.accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+
+# Mimetypes worth compressing; images and fonts are already compressed
+COMPRESSIBLE = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+# Below this many bytes the headers outweigh the savings
+MIN_SIZE = 1024
+
+
+class CompressionStats:
+    """Running totals of dynamic response compression, for judging its cost."""
+
+    def __init__(self):
+        self.responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, bytes_in: int, bytes_out: int, seconds: float) -> None:
+        with self._lock:
+            self.responses += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.seconds += seconds
+
+    def summary(self) -> Dict[str, float]:
+        responses = self.responses or 1
+        return {
+            "responses": self.responses,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "bytes_saved_per_response": (self.bytes_in - self.bytes_out) / responses,
+            "cpu_ms_per_response": self.seconds / responses * 1000,
+        }
+
+
+def is_compressible(mimetype: Optional[str]) -> bool:
+    return mimetype is not None and mimetype.startswith(COMPRESSIBLE)
+
+
+def init_compression(app, min_size: int = MIN_SIZE) -> None:
+    """Compress dynamic responses above `min_size` bytes for clients that accept it.
+
+    Responses that already carry a Content-Encoding (the shared /api/world and
+    terrain caches, precompressed static assets) and streamed responses are
+    left alone.
+    """
+    app.compression_stats = CompressionStats()
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or not is_compressible(response.mimetype)
+        ):
+            return response
+
+        encoding = choose_encoding(request)
+        response.vary.add("Accept-Encoding")
+        if encoding is None:
+            return response
+
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+
+        start = time.process_time()
+        compressed = COMPRESSORS[encoding](body)
+        app.compression_stats.record(len(body), len(compressed), time.process_time() - start)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
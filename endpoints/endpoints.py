@@ -1,9 +1,14 @@
-import json
-from flask import Blueprint, current_app, render_template
+from urllib.parse import urlencode
+
+from flask import Blueprint, abort, current_app, render_template, request
+
+from endpoints.recordings import open_recording
 
 
 endpoints_bp = Blueprint("endpoints", __name__)
 
+THOUGHTS_PER_PAGE = 20
+
 
 @endpoints_bp.get("/")
 def index():
@@ -15,16 +20,51 @@ def dragons():
     return render_template("dragons.html")
 
 
-@endpoints_bp.get("/world")
-def world_route():
-    height_map = current_app.world.height_map
-    return render_template("world.html", height_map=json.dumps(height_map))
+@endpoints_bp.get("/world", defaults={"world_id": None})
+@endpoints_bp.get("/world/<world_id>")
+def world_route(world_id):
+    if world_id is None:
+        world = current_app.world
+        api = {"world": "/api/world", "entity": "/api/entity", "terrain": "/api/terrain"}
+    else:
+        world = current_app.worlds.get(world_id)
+        if world is None:
+            abort(404)
+        base = f"/api/world/{world_id}"
+        api = {"world": base, "entity": f"{base}/entity", "terrain": f"{base}/terrain"}
+    return render_template("world.html", seed=world.seed, api=api)
+
+
+@endpoints_bp.get("/replay/<name>")
+def replay_route(name):
+    """Play a recording over its world's terrain; `from` and `speed` go to the stream."""
+    header = open_recording(name).header
+    world_id = header.get("world_id")
+    if world_id is None:
+        if current_app.world.seed != header["seed"]:
+            abort(409, f"Recorded on seed {header['seed']}, the site's world now has seed {current_app.world.seed}")
+        api = {"world": "/api/world", "entity": "/api/entity", "terrain": "/api/terrain"}
+    else:
+        base = f"/api/world/{world_id}"
+        api = {"world": base, "entity": f"{base}/entity", "terrain": f"{base}/terrain"}
+    query = {key: request.args[key] for key in ("from", "speed") if key in request.args}
+    api["stream"] = f"/api/recordings/{name}/stream?" + urlencode(dict(query, format="columnar"))
+    api["playback"] = True
+    return render_template("world.html", seed=header["seed"], api=api)
 
 
 @endpoints_bp.get("/endpoints")
 def endpoints():
-    # Convert defaultdict to regular dict and sort by access count
-    sorted_stats = sorted(current_app.endpoint_stats.items(), key=lambda x: x[1], reverse=True)
+    # Merged across all workers, sorted by access count
+    merged = current_app.request_metrics.merged()
+    sorted_stats = sorted(
+        (
+            (route, h.count, h.percentile(0.50), h.percentile(0.95), h.percentile(0.99))
+            for route, h in merged.items()
+        ),
+        key=lambda x: x[1],
+        reverse=True,
+    )
     return render_template("endpoints.html", endpoint_stats=sorted_stats)
 
 
@@ -57,6 +97,20 @@ def names():
 
 @endpoints_bp.get("/thoughts/<name>")
 def thoughts(name):
+    page = max(1, request.args.get("page", 1, type=int))
+    entity = current_app.world.entities_by_name.get(name.lower())
+    if entity is not None:
+        # Live entity: its most recent thoughts, newest first
+        offset = (page - 1) * THOUGHTS_PER_PAGE
+        return render_template(
+            "thoughts.html",
+            name=entity.name,
+            thoughts=entity.recent_thoughts(offset, THOUGHTS_PER_PAGE),
+            page=page,
+            has_next=offset + THOUGHTS_PER_PAGE < len(entity.thoughts),
+            forgotten=entity.thought_count - len(entity.thoughts),
+        )
+
     thoughts_db = {
         "smaug": [
             "Gold gleams in the firelight.",
@@ -79,4 +133,4 @@ def thoughts(name):
     }
     
     thoughts_data = thoughts_db.get(name.lower(), [f"No recorded thoughts for {name}"])
-    return render_template("thoughts.html", name=name, thoughts=thoughts_data)
+    return render_template("thoughts.html", name=name, thoughts=thoughts_data, page=1, has_next=False, forgotten=0)
@@ -0,0 +1,175 @@
+"""Memory introspection for the long-running process, enabled with DEBUG_MEMORY=1.
+
+    GET  /api/debug/memory[/<world_id>]        entity census and the big shared structures
+    POST /api/debug/memory/tracemalloc/start   begin tracing (?frames=n, 1 to MAX_FRAMES, default 1)
+    GET  /api/debug/memory/tracemalloc         top allocations, and the diff since the last call
+    POST /api/debug/memory/tracemalloc/stop    stop tracing and drop the snapshots
+
+The census is taken between ticks and measures at most SAMPLE_SIZE entities
+per class, scaling their sizes up to the class count, so it stays cheap on
+large worlds. Bytes are shallow sizes of each entity and the containers it
+owns (path, thoughts, domain_tiles, ...); objects shared between entities,
+such as interned thoughts, route tuples and the heightmap, are reported once
+on their own. Only worlds that are already loaded are measured, so the
+census never builds or restores one. Without the flag the routes are not
+registered at all.
+"""
+import os
+import sys
+import threading
+import tracemalloc
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+
+from flask import Blueprint, current_app, jsonify, request
+
+SAMPLE_SIZE = 200  # Entities measured per class
+TOP_ALLOCATIONS = 25
+MAX_FRAMES = 65535  # tracemalloc's own limit on traceback depth
+
+memory_bp = Blueprint("memory", __name__)
+_snapshot_lock = threading.Lock()
+_last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+def owned_bytes(value: Any) -> int:
+    """Shallow size of a container and the tuples directly inside it."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, deque)):
+        size += sum(sys.getsizeof(item) for item in value if isinstance(item, tuple))
+    return size
+
+
+def entity_bytes(entity) -> int:
+    size = sys.getsizeof(entity)
+    for name in getattr(type(entity), "__slots__", ()):
+        value = getattr(entity, name, None)
+        if isinstance(value, (list, dict, set, deque)):
+            size += owned_bytes(value)
+    return size
+
+
+def height_map_bytes(height_map) -> int:
+    # Every row has the same width and holds floats
+    if not height_map:
+        return 0
+    row = height_map[0]
+    return sys.getsizeof(height_map) + len(height_map) * (sys.getsizeof(row) + len(row) * sys.getsizeof(0.0))
+
+
+def census(world) -> Dict[str, Any]:
+    classes: Dict[str, Dict[str, Any]] = {}
+    paths = thoughts = thoughts_ever = domain_tiles = 0
+    with getattr(world, "_tick_lock", None) or nullcontext():
+        for entity in list(world.entities):
+            name = type(entity).__name__
+            stats = classes.get(name)
+            if stats is None:
+                stats = classes[name] = {"count": 0, "sampled": 0, "sampled_bytes": 0}
+            stats["count"] += 1
+            if stats["sampled"] < SAMPLE_SIZE:
+                stats["sampled"] += 1
+                stats["sampled_bytes"] += entity_bytes(entity)
+            paths += len(getattr(entity, "path", None) or ())
+            thoughts += len(getattr(entity, "thoughts", None) or ())
+            thoughts_ever += getattr(entity, "thought_count", 0)
+            domain_tiles += len(getattr(entity, "domain_tiles", None) or ())
+
+        routes = getattr(world, "routes", None)
+        changes = getattr(world, "changes", None)
+        result = {
+            "entities": len(world.entities),
+            "tick": getattr(world, "update_count", None),
+            "path_steps": paths,
+            "thoughts": thoughts,
+            "thoughts_ever": thoughts_ever,
+            "domain_tiles": domain_tiles,
+            "routes": {
+                "count": len(routes.routes),
+                "steps": sum(len(route) for route in routes.routes.values()),
+            } if routes is not None else None,
+            "change_log_entries": len(changes.history) if changes is not None else None,
+            "height_map_bytes": height_map_bytes(getattr(world, "height_map", None)),
+        }
+
+    for stats in classes.values():
+        average = stats.pop("sampled_bytes") / stats["sampled"]
+        stats["approx_bytes"] = int(average * stats["count"])
+    result["classes"] = classes
+    result["approx_entity_bytes"] = sum(stats["approx_bytes"] for stats in classes.values())
+    return result
+
+
+@memory_bp.get("/api/debug/memory", defaults={"world_id": None})
+@memory_bp.get("/api/debug/memory/<world_id>")
+def get_memory(world_id):
+    if world_id is None:
+        world = current_app.world
+    else:
+        world = current_app.worlds.worlds.get(world_id)
+        if world is None:
+            return jsonify({"error": f"World {world_id!r} is not loaded"}), 404
+    return jsonify(census(world))
+
+
+@memory_bp.post("/api/debug/memory/tracemalloc/start")
+def start_tracing():
+    global _last_snapshot
+    frames = request.args.get("frames", default=1, type=int)
+    if not 1 <= frames <= MAX_FRAMES:
+        return jsonify({"error": f"frames must be between 1 and {MAX_FRAMES}"}), 400
+    with _snapshot_lock:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        _last_snapshot = None
+        tracemalloc.start(frames)
+    return jsonify({"tracing": True, "frames": frames})
+
+
+@memory_bp.post("/api/debug/memory/tracemalloc/stop")
+def stop_tracing():
+    global _last_snapshot
+    with _snapshot_lock:
+        tracemalloc.stop()
+        _last_snapshot = None
+    return jsonify({"tracing": False})
+
+
+@memory_bp.get("/api/debug/memory/tracemalloc")
+def get_allocations():
+    """Top allocating lines now, and how each changed since the previous call."""
+    global _last_snapshot
+    limit = max(1, request.args.get("limit", default=TOP_ALLOCATIONS, type=int))
+    key = "traceback" if request.args.get("group") == "traceback" else "lineno"
+    with _snapshot_lock:
+        if not tracemalloc.is_tracing():
+            return jsonify({"error": "tracemalloc is not running, POST .../tracemalloc/start first"}), 409
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        previous, _last_snapshot = _last_snapshot, snapshot
+        current, peak = tracemalloc.get_traced_memory()
+
+    result = {
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "top": [
+            {"where": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics(key)[:limit]
+        ],
+        "diff": None,
+    }
+    if previous is not None:
+        result["diff"] = [
+            {"where": str(stat.traceback), "bytes": stat.size_diff, "count": stat.count_diff}
+            for stat in snapshot.compare_to(previous, key)[:limit]
+        ]
+    return jsonify(result)
+
+
+def init_memory_debug(app) -> None:
+    """Register the memory routes if DEBUG_MEMORY is set."""
+    if os.environ.get("DEBUG_MEMORY", "") not in ("", "0"):
+        app.register_blueprint(memory_bp)
@@ -0,0 +1,185 @@
+"""Per-route request counts and latency histograms, merged across worker processes.
+
+Every worker keeps its own fixed-size histograms in memory and periodically
+publishes them as a small file in a directory shared by all workers of the
+same server (tmpfs when available). `/endpoints` merges every worker's file,
+so the view no longer depends on which worker answers.
+"""
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from flask import g, request
+
+# Log-spaced latency buckets: bucket i holds samples up to BASE_MS * GROWTH ** i
+BASE_MS = 0.01
+GROWTH = 1.2
+BUCKETS = 80  # Top bucket starts around 21 seconds
+_LOG_GROWTH = math.log(GROWTH)
+
+
+def bucket_index(ms: float) -> int:
+    if ms <= BASE_MS:
+        return 0
+    return min(BUCKETS - 1, int(math.log(ms / BASE_MS) / _LOG_GROWTH) + 1)
+
+
+class Histogram:
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.buckets: List[int] = [0] * BUCKETS
+
+    def record(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.buckets[bucket_index(ms)] += 1
+
+    def merge(self, count: int, total_ms: float, buckets: List[int]) -> None:
+        self.count += count
+        self.total_ms += total_ms
+        for i, n in enumerate(buckets):
+            self.buckets[i] += n
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given quantile, within 20%."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return BASE_MS * GROWTH ** i
+        return BASE_MS * GROWTH ** (BUCKETS - 1)
+
+
+def process_start(pid: int) -> str:
+    """Start time of a process in clock ticks on Linux, so a reused pid gets a new key; empty elsewhere."""
+    try:
+        with open(f"/proc/{pid}/stat") as file:
+            return file.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return ""
+
+
+def default_directory() -> str:
+    """Directory shared by the workers of one server, keyed by the parent process.
+
+    A process whose parent is init (PID 1 in containers) is not one of
+    several workers, so it keys the directory by itself instead of sharing
+    it with every other orphan.
+    """
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    owner = os.getppid()
+    if owner <= 1:
+        owner = os.getpid()
+    start = process_start(owner)
+    return os.path.join(base, f"here-be-metrics-{owner}" + (f"-{start}" if start else ""))
+
+
+def is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Exists, owned by someone else
+    return True
+
+
+class RequestMetrics:
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 2.0):
+        self.directory = directory or os.environ.get("METRICS_DIR") or default_directory()
+        self.flush_interval = flush_interval
+        self.routes: Dict[str, Histogram] = {}
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        # Evaluated lazily so forked workers each get their own file
+        return os.path.join(self.directory, f"worker-{os.getpid()}.json")
+
+    def record(self, route: str, ms: float) -> None:
+        with self._lock:
+            histogram = self.routes.get(route)
+            if histogram is None:
+                histogram = self.routes[route] = Histogram()
+            histogram.record(ms)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Publish this worker's histograms for the other workers to read."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            snapshot = {
+                route: [h.count, h.total_ms, h.buckets]
+                for route, h in self.routes.items()
+            }
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, "w") as file:
+                json.dump(snapshot, file, separators=(",", ":"))
+            os.replace(temporary, self.path)
+        except OSError as e:
+            print(f"Could not publish request metrics: {e}")
+
+    def merged(self) -> Dict[str, Histogram]:
+        """Histograms summed over every worker that has published."""
+        self.flush()
+        merged: Dict[str, Histogram] = {}
+        for name in os.listdir(self.directory):
+            if not (name.startswith("worker-") and name.endswith(".json")):
+                continue
+            pid = name[len("worker-"):-len(".json")]
+            if pid.isdigit() and not is_alive(int(pid)):
+                # A worker that exited or was recycled; its requests are forgotten with it
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError):
+                continue  # Worker was mid-write or has gone away
+            for route, (count, total_ms, buckets) in snapshot.items():
+                merged.setdefault(route, Histogram()).merge(count, total_ms, buckets)
+        return merged
+
+
+UNMATCHED = "<unmatched>"
+
+
+def route_name() -> str:
+    """The URL rule that matched, so the number of histograms is bounded by the routes."""
+    if request.url_rule is None:
+        return UNMATCHED  # 404s and probes share one bucket
+    return request.url_rule.rule
+
+
+def init_metrics(app) -> None:
+    """Time every non-static request and expose the merged view as app.request_metrics."""
+    metrics = RequestMetrics()
+    app.request_metrics = metrics
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("request_started", None)
+        if started is not None and not request.path.startswith("/static/"):
+            metrics.record(route_name(), (time.perf_counter() - started) * 1000)
+        return response
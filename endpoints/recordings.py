@@ -0,0 +1,83 @@
+"""Playback of world recordings kept in WORLD_RECORDING_DIR (see world.recorder)."""
+import json
+import os
+import time
+
+from flask import Blueprint, Response, abort, jsonify, make_response, request, stream_with_context
+
+from endpoints.api import parse_format
+from endpoints.columnar import columnar_payload
+from world.recorder import Recording, recording_dir, recording_path
+
+MIN_SPEED = 1.0
+MAX_SPEED = 100.0
+MAX_GAP = 2.0  # Seconds waited at most between frames, e.g. across a suspension
+
+recordings_bp = Blueprint("recordings", __name__)
+
+
+def open_recording(name: str) -> Recording:
+    directory = recording_dir()
+    path = recording_path(directory, name) if directory else None
+    if path is None or not os.path.exists(path):
+        abort(make_response(jsonify({"error": f"No recording {name!r}"}), 404))
+    try:
+        return Recording(path)
+    except (OSError, ValueError) as e:
+        abort(make_response(jsonify({"error": str(e)}), 500))
+
+
+@recordings_bp.get("/api/recordings")
+def list_recordings():
+    """Every recording with its seed, world id and tick range, newest first."""
+    directory = recording_dir()
+    recordings = []
+    if directory and os.path.isdir(directory):
+        for filename in sorted(os.listdir(directory), reverse=True):
+            name, extension = os.path.splitext(filename)
+            path = recording_path(directory, name)
+            if extension != ".rec" or path is None:
+                continue
+            try:
+                recordings.append(dict(Recording(path).describe(), name=name))
+            except (OSError, ValueError):
+                continue
+    return jsonify({"recordings": recordings})
+
+
+@recordings_bp.get("/api/recordings/<name>")
+def get_recording(name):
+    return jsonify(dict(open_recording(name).describe(), name=name))
+
+
+@recordings_bp.get("/api/recordings/<name>/stream")
+def stream_recording(name):
+    """Play a recording as server-sent events, in the same payloads as /api/world/stream.
+
+    `from=<tick>` seeks to that tick, reading at most one keyframe interval
+    of frames. `speed` runs from 1 (real time) to 100. `format=columnar` is
+    supported, viewports are not: recordings hold the whole world.
+    """
+    recording = open_recording(name)
+    start = request.args.get("from", type=int)
+    speed = min(MAX_SPEED, max(MIN_SPEED, request.args.get("speed", default=1.0, type=float)))
+    fmt = parse_format(request.args)
+    width = recording.header["width"]
+    seconds_per_tick = recording.header["update_interval"] / speed
+
+    def events():
+        previous = None
+        for payload in recording.frames(start):
+            if previous is not None:
+                time.sleep(min(MAX_GAP, (payload["update_count"] - previous) * seconds_per_tick))
+            previous = payload["update_count"]
+            if fmt == "columnar":
+                payload = columnar_payload(payload, width)
+            yield b"data: " + json.dumps(payload, separators=(",", ":")).encode() + b"\n\n"
+        yield b"event: end\ndata: {}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,101 @@
+"""Encode-once cache of /api/world responses for the current tick."""
+import json
+import threading
+from typing import Dict, Optional, Tuple
+
+from endpoints.columnar import columnar_payload
+from endpoints.compression import COMPRESSORS, MIN_SIZE
+from world.spatial import Bounds
+
+
+class CachedPayload:
+    """JSON body for one tick, with compressed variants built on first use."""
+
+    def __init__(self, etag: str, body: bytes):
+        self.etag = etag
+        self.body = body
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        """The encoding actually applied and the body in it; small bodies stay uncompressed."""
+        if encoding is None or len(self.body) < MIN_SIZE:
+            return None, self.body
+        data = self._encoded.get(encoding)
+        if data is None:
+            with self._lock:
+                data = self._encoded.get(encoding)
+                if data is None:
+                    data = COMPRESSORS[encoding](self.body)
+                    self._encoded[encoding] = data
+        return encoding, data
+
+
+_lock = threading.Lock()
+
+
+class WorldResponseCache:
+    """Shares one serialized payload per (tick, since, viewport, format) between all requests.
+
+    Entries from older ticks are dropped as soon as the world moves on, so the
+    cache never holds more than one tick's worth of payloads.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._tick: Optional[int] = None
+        self._entries: Dict[Tuple[Optional[int], Optional[Bounds], str], CachedPayload] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def etag(world, tick: int, since: Optional[int], viewport: Optional[Bounds], fmt: str) -> str:
+        """ETag derived from the world seed, the tick, the delta base, the viewport and the format."""
+        etag = f"w{world.seed}-{tick}-{fmt}"
+        if since is not None:
+            etag += f"-{since}"
+        if viewport is not None:
+            etag += "-v" + ".".join(str(edge) for edge in viewport)
+        return etag
+
+    def get(
+        self,
+        world,
+        since: Optional[int],
+        viewport: Optional[Bounds] = None,
+        fmt: str = "json",
+    ) -> CachedPayload:
+        changes = world.get_changes()
+        key = (since, viewport, fmt)
+        with self._lock:
+            if self._tick != changes.tick:
+                self._tick = changes.tick
+                self._entries.clear()
+            cached = self._entries.get(key)
+            if cached is not None:
+                return cached
+
+            # Built under the lock so concurrent requests wait for one encode
+            payload = changes.delta(since, viewport) if since is not None else None
+            if payload is None:
+                payload = changes.keyframe(viewport)
+                since = None
+            payload["timestamp"] = changes.timestamp
+            if fmt == "columnar":
+                payload = columnar_payload(payload, world.WIDTH)
+            cached = CachedPayload(
+                self.etag(world, payload["update_count"], since, viewport, fmt),
+                json.dumps(payload, separators=(",", ":")).encode(),
+            )
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[key] = cached
+            return cached
+
+
+def get_response_cache(world) -> WorldResponseCache:
+    """Get the world's response cache, creating it on first use."""
+    with _lock:
+        responses = getattr(world, "responses", None)
+        if responses is None:
+            responses = world.responses = WorldResponseCache()
+        return responses
@@ -0,0 +1,76 @@
+"""Static files hashed and precompressed once at startup."""
+import hashlib
+import mimetypes
+import os
+from typing import Dict, Optional
+
+from flask import Response, abort, request
+
+from endpoints.compression import COMPRESSORS, MIN_SIZE, choose_encoding, is_compressible
+
+# Versioned URLs (?v=<hash>) never change content, so they may be cached forever
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class StaticAsset:
+
+    def __init__(self, data: bytes, mimetype: str):
+        self.data = data
+        self.mimetype = mimetype
+        self.hash = hashlib.sha256(data).hexdigest()[:12]
+        self.encoded: Dict[str, bytes] = {}
+        if is_compressible(mimetype) and len(data) >= MIN_SIZE:
+            for encoding, compress in COMPRESSORS.items():
+                compressed = compress(data)
+                if len(compressed) < len(data):
+                    self.encoded[encoding] = compressed
+
+
+class StaticAssets:
+    """Serves the static folder from memory with content-hash ETags."""
+
+    def __init__(self, folder: str):
+        self.assets: Dict[str, StaticAsset] = {}
+        for root, _, files in os.walk(folder):
+            for name in files:
+                path = os.path.join(root, name)
+                key = os.path.relpath(path, folder).replace(os.sep, "/")
+                mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                with open(path, "rb") as file:
+                    self.assets[key] = StaticAsset(file.read(), mimetype)
+
+    def url(self, filename: str) -> str:
+        """URL of a static file with its content hash, for immutable caching."""
+        asset = self.assets.get(filename)
+        if asset is None:
+            return f"/static/{filename}"
+        return f"/static/{filename}?v={asset.hash}"
+
+    def serve(self, filename: str) -> Response:
+        asset: Optional[StaticAsset] = self.assets.get(filename)
+        if asset is None:
+            abort(404)
+
+        if request.if_none_match.contains(asset.hash):
+            response = Response(status=304)
+        else:
+            encoding = choose_encoding(request)
+            if encoding in asset.encoded:
+                response = Response(asset.encoded[encoding], mimetype=asset.mimetype)
+                response.headers["Content-Encoding"] = encoding
+            else:
+                response = Response(asset.data, mimetype=asset.mimetype)
+
+        response.set_etag(asset.hash)
+        response.vary.add("Accept-Encoding")
+        # Unversioned URLs (e.g. ES module imports) revalidate against the hash
+        response.headers["Cache-Control"] = IMMUTABLE if request.args.get("v") == asset.hash else "no-cache"
+        return response
+
+
+def init_static_assets(app) -> None:
+    """Replace Flask's static view with the precompressed in-memory one."""
+    assets = StaticAssets(app.static_folder)
+    app.static_assets = assets
+    app.view_functions["static"] = assets.serve
+    app.add_template_global(assets.url, "asset_url")
@@ -5,13 +5,16 @@ from entities.base.thinking import Thinking
 
 class Bandit(Mobile, Thinking):
 
+    __slots__ = ("thoughts", "thought_count", "intent")
+
+    loiter = 1
+
     def __init__(
         self,
         coordinates: Coordinates,
     ):
         Mobile.__init__(self, "#960000", 'Ω', coordinates, 20)
         Thinking.__init__(self)
-        self.loiter = 1
     
     def approach_target(self, world) -> None:
         pass
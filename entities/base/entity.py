@@ -1,12 +1,25 @@
 """Base entity class for all game entities."""
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Iterable, Optional
 
 
 Coordinates = Tuple[int, int]
 
+_UNSET = object()
+
 
 class Entity:
 
+    # Entities are numerous, so no class in the hierarchy has a __dict__.
+    # Mixins declare empty slots and concrete classes list the mixin fields.
+    __slots__ = (
+        "id", "color", "character", "coordinates", "life", "is_alive", "is_dead",
+        "_serialized", "_dirty_sink", "_scheduler",
+    )
+
+    # Attributes that feed serialize(); assigning a new value to one of them
+    # drops the cached serialization and reports the entity to the world
+    SERIALIZED_FIELDS = frozenset({"id", "color", "character", "coordinates", "is_dead"})
+
     def __init__(
         self,
         color: str,
@@ -14,6 +27,11 @@ class Entity:
         coordinates: Coordinates,
         life: int,
     ):
+        # Bookkeeping first: __setattr__ relies on it
+        object.__setattr__(self, "_serialized", None)  # Optional[Dict[str, Any]]
+        object.__setattr__(self, "_dirty_sink", None)  # The world's set of changed entity ids
+        object.__setattr__(self, "_scheduler", None)  # The world's Scheduler, while in a world
+        self.id = None  # Assigned by the world when the entity is added
         self.color = color
         self.character = character
         self.coordinates = coordinates
@@ -21,28 +39,92 @@ class Entity:
         self.is_alive = True
         self.is_dead = False
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self.SERIALIZED_FIELDS and getattr(self, name, _UNSET) != value:
+            self.mark_dirty()
+        object.__setattr__(self, name, value)
+
+    def __setstate__(self, state) -> None:
+        # Unpickling restores slots directly, without reporting every field as changed
+        _, slots = state if isinstance(state, tuple) else (None, state)
+        for name, value in slots.items():
+            object.__setattr__(self, name, value)
+
+    def mark_dirty(self) -> None:
+        """Invalidate the cached serialization, e.g. after mutating a field in place."""
+        self._serialized = None
+        if self._dirty_sink is not None:
+            self._dirty_sink.add(self.id)
+    
     def update(self, world) -> None:
         raise NotImplementedError("Subclasses must implement update()")
+
+    def next_wake(self, world) -> Optional[int]:
+        """Ticks until update() has work again, or None to sleep until woken.
+
+        Updates in between must only advance state that skip() can catch up,
+        and must not change what serialize() returns unless world.catching_up.
+        """
+        return 1
+
+    def skip(self, ticks: int) -> None:
+        """Apply `ticks` updates that next_wake() promised would be idle."""
+
+    def watches(self) -> Iterable["Entity"]:
+        """Entities whose death should wake this one."""
+        return ()
+
+    def sync(self) -> None:
+        """Catch up skipped ticks now; call before reading state another entity may skip."""
+        if self._scheduler is not None:
+            self._scheduler.sync(self)
+
+    def wake(self) -> None:
+        """Schedule an update for the next chance, e.g. after outside code changed the entity."""
+        if self._scheduler is not None:
+            self._scheduler.wake(self)
     
     def hurt(self, damage: int) -> None:
+        self.sync()
         self.life -= damage
+        self.wake()
         if self.life <= 0:
             self.die()
     
     def heal(self, amount: int) -> None:
+        self.sync()
         self.life += amount
+        self.wake()
 
     def die(self, world, reason) -> None:
         self.is_dead = True
         self.is_alive = False
+        if self._scheduler is not None:
+            self._scheduler.notify_death(self)
     
     def serialize(self) -> Dict[str, Any]:
-        """Serialize entity to dictionary for JSON output."""
+        """Serialize entity to dictionary for JSON output.
+
+        The dict is cached until a serialized field changes, so callers must
+        treat it as read-only.
+        """
+        if self._serialized is None:
+            self._serialized = self._serialize()
+        return self._serialized
+
+    def _serialize(self) -> Dict[str, Any]:
+        """Build the serialized dict; subclasses extend this, not serialize()."""
         return {
+            "id": self.id,
+            "kind": self.__class__.__name__.lower(),
             "color": self.color,
             "character": self.character,
             "coordinates": list(self.coordinates),
         }
+
+    def describe(self) -> str:
+        """Human-readable debug line, sent to clients only on request."""
+        return f"{self.__class__.__name__} at {self.coordinates}"
     
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(life={self.life})"
@@ -7,6 +7,10 @@ sqrt2 = 2 ** 0.5
 
 class Mobile(Entity):
 
+    __slots__ = ("state", "destination", "loiter_counter", "movement_debt")
+
+    loiter = 0  # Ticks spent between steps, fixed per type
+
     def __init__(
         self,
         color: str,
@@ -18,7 +22,6 @@ class Mobile(Entity):
         super().__init__(color, character, coordinates, life)
         self.state = "created"
         self.destination: Optional[Coordinates] = destination
-        self.loiter = 0
         self.loiter_counter = 0
         self.movement_debt = 0.0  # Accumulated cost from diagonal movement
     
@@ -157,6 +160,16 @@ class Mobile(Entity):
             
             if self.coordinates == self.destination:
                 self.state = "arrived"
+
+    def next_wake(self, world) -> Optional[int]:
+        # While loitering, updates only count up to the next step
+        if self.state == "moving" and self.loiter_counter < self.loiter and self.coordinates != self.destination:
+            return self.loiter - self.loiter_counter + 1
+        return 1
+
+    def skip(self, ticks: int) -> None:
+        if self.state == "moving":
+            self.loiter_counter += ticks
     
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(state={self.state}, pos={self.coordinates})"
@@ -1,5 +1,7 @@
 """Named entity mixin - for entities that have personal names."""
 class Named:
 
+    __slots__ = ()  # Concrete classes declare "name"
+
     def __init__(self, name: str):
         self.name = name
@@ -2,11 +2,22 @@
 from entities.base.entity import Entity, Coordinates
 from entities.base.named import Named
 from entities.base.thinking import Thinking
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Optional, Tuple
+
+TileTemplate = Tuple[int, int, str, str]  # (dx, dy, symbol, color) from the settlement's coordinates
+Tile = Tuple[Coordinates, str, str]
 
 
 class Settlement(Entity, Named, Thinking):
     """Base class for all settlement types."""
+
+    __slots__ = ("name", "thoughts", "thought_count", "intent", "settlement_type", "_tiles")
+
+    SERIALIZED_FIELDS = Entity.SERIALIZED_FIELDS | {"name", "settlement_type"}
+
+    # Layouts are shared by every settlement of a type; subclasses fill them in
+    TILES: Tuple[TileTemplate, ...] = ()
+    DEPLETED_TILES: Tuple[TileTemplate, ...] = ()
     
     def __init__(
         self,
@@ -19,33 +30,47 @@ class Settlement(Entity, Named, Thinking):
         Named.__init__(self, name)
         Thinking.__init__(self)
         self.settlement_type = settlement_type
+        self._tiles = None  # (coordinates, is_dead), tiles, occupied set
         
-    def get_tiles(self) -> List[Tuple[Coordinates, str, str]]:
-        """Return list of (coordinates, symbol, color) for all tiles in settlement."""
-        raise NotImplementedError
+    def get_tiles(self) -> Tuple[Tile, ...]:
+        """Return (coordinates, symbol, color) for all tiles in settlement.
+
+        Placed from the class template once per position and depletion state.
+        """
+        key = (self.coordinates, self.is_dead)
+        if self._tiles is None or self._tiles[0] != key:
+            x, y = self.coordinates
+            template = self.DEPLETED_TILES if self.is_dead else self.TILES
+            tiles = tuple(((x + dx, y + dy), symbol, color) for dx, dy, symbol, color in template)
+            self._tiles = (key, tiles, frozenset(tile for tile, _, _ in tiles))
+        return self._tiles[1]
     
     def occupies(self, coordinates: Coordinates) -> bool:
         """Check if this settlement occupies the given coordinates."""
-        tiles = self.get_tiles()
-        for tile_coords, _, _ in tiles:
-            if tile_coords == coordinates:
-                return True
-        return False
+        self.get_tiles()
+        return coordinates in self._tiles[2]
     
     def die(self, world, reason) -> None:
         """Handle settlement death/depletion."""
         super().die(world, reason)
+        world.routes.invalidate()  # Depleted settlements are no longer trade stops
     
     def update(self, world) -> None:
         if self.life <= 0 and self.is_alive:
             self.die(world)
 
-    def serialize(self) -> Dict[str, Any]:
+    def next_wake(self, world) -> Optional[int]:
+        # Nothing to do until something hurts the settlement
+        return 1 if self.life <= 0 and self.is_alive else None
+
+    def _serialize(self) -> Dict[str, Any]:
         """Serialize settlement to dictionary for JSON output."""
-        data = super().serialize()
+        data = super()._serialize()
         data["name"] = self.name
         data["settlement_type"] = self.settlement_type
         data["depleted"] = self.is_dead
         data["tiles"] = self.get_tiles()
-        data["debug_info"] = f"{self.name} ({self.settlement_type}) at {self.coordinates}"
         return data
+
+    def describe(self) -> str:
+        return f"{self.name} ({self.settlement_type}) at {self.coordinates}"
@@ -1,12 +1,29 @@
 """Thinking entity mixin - for entities that have thoughts."""
-from typing import List
+import sys
+from collections import deque
+from typing import Deque, List, Sequence
+
+THOUGHT_CAPACITY = 64  # Older thoughts are forgotten
+NO_THOUGHTS = ()  # Shared by every entity until its first thought
 
 
 class Thinking:
 
+    __slots__ = ()  # Concrete classes declare "thoughts", "thought_count" and "intent"
+
     def __init__(self, intent: str = "idle"):
-        self.thoughts: List[str] = []
+        self.thoughts: Sequence[str] = NO_THOUGHTS
+        self.thought_count = 0  # Every thought ever had, including forgotten ones
         self.intent: str = intent
 
     def think(self, thought: str) -> None:
-        self.thoughts.append(thought)
+        if self.thoughts is NO_THOUGHTS:
+            self.thoughts: Deque[str] = deque(maxlen=THOUGHT_CAPACITY)
+        # Entities repeat the same few thoughts, so share one copy of each
+        self.thoughts.append(sys.intern(thought))
+        self.thought_count += 1
+
+    def recent_thoughts(self, offset: int = 0, limit: int = THOUGHT_CAPACITY) -> List[str]:
+        """Remembered thoughts, newest first."""
+        newest_first = list(self.thoughts)[::-1]  # Copy first, the world thread may be appending
+        return newest_first[offset:offset + limit]
@@ -1,23 +1,20 @@
 """Worker camp settlement."""
 from entities.base.settlement import Settlement
 from entities.base.entity import Coordinates
-from typing import List, Tuple
 
 
 class Camp(Settlement):
     """2x2 worker camp made of brown diamonds."""
+
+    __slots__ = ()
+
+    TILES = (
+        (0, 0, "Λ", "#8B4513"),
+        (1, 0, "Λ", "#8B4513"),
+        (0, 1, "Λ", "#8B4513"),
+        (1, 1, "Λ", "#8B4513"),
+    )
+    DEPLETED_TILES = ()  # Worker camp disappears when depleted
     
     def __init__(self, name: str, coordinates: Coordinates):
         super().__init__(name, coordinates, life=200, settlement_type="worker_camp")
-    
-    def get_tiles(self) -> List[Tuple[Coordinates, str, str]]:
-        """Return all 2x2 tiles for the worker camp."""
-        if self.is_dead:
-            return []  # Worker camp disappears when depleted
-        
-        x, y = self.coordinates
-        tiles = []
-        for dy in [0, 1]:
-            for dx in [0, 1]:
-                tiles.append(((x + dx, y + dy), "Λ", "#8B4513"))
-        return tiles
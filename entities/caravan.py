@@ -1,42 +1,43 @@
 from entities.base.mobile import Mobile
-from entities.base.entity import Coordinates
+from entities.base.entity import Coordinates, Entity
 from entities.base.thinking import Thinking
 from entities.base.settlement import Settlement
-from typing import TYPE_CHECKING, Dict, Any
+from typing import Dict, Any, Iterable, Optional, Tuple
 
 
 class Caravan(Mobile, Thinking):
 
+    __slots__ = (
+        "thoughts", "thought_count", "intent",
+        "home", "current_target", "path", "route", "route_index",
+    )
+
+    SERIALIZED_FIELDS = Mobile.SERIALIZED_FIELDS | {"home", "destination"}
+
+    loiter = 4
+
     def __init__(
         self,
         coordinates: Coordinates,
         destination: "Settlement | Coordinates",
         intent: str,
+        home: Optional[Settlement] = None,
     ):
         Mobile.__init__(self, "#2b1c00", '@', coordinates, 50, destination)
         Thinking.__init__(self, intent)
-        self.loiter = 4
+        self.home = home
         self.current_target: Coordinates = destination.coordinates if hasattr(destination, "coordinates") else destination
         self.path: list[Coordinates] = []
+        self.route: Tuple[Coordinates, ...] = ()  # Shared with other caravans, never modified
+        self.route_index = 0
     
     def die(self, world, reason):
-        super().die(world)
+        super().die(world, reason)
+        world.remove_entity(self)
 
     def is_passable(self, coordinates, world):
         """Check if a tile is passable (field, not through settlements)."""
-        x, y = coordinates
-        if x < 0 or y < 0 or x >= len(world.height_map[0]) or y >= len(world.height_map):
-            return False  # Out of bounds
-        
-        height = world.height_map[coordinates[1]][coordinates[0]]
-        if world.get_biome_from_height(height) != 'field':
-            return False
-        
-        for entity in world.entities if hasattr(world, 'entities') else []:
-            if isinstance(entity, Settlement) and entity.occupies(coordinates):
-                return False
-        
-        return True
+        return world.is_open(coordinates)
     
     def is_nearby_target(self, world) -> bool:
         """Check if caravan is nearby its current destination."""
@@ -51,7 +52,19 @@ class Caravan(Mobile, Thinking):
     
     def approach_target(self, world) -> None:
         """Move one step along the path to the destination."""
-        
+
+        if self.route_index < len(self.route):
+            self.move_to(self.route[self.route_index])
+            self.route_index += 1
+            return
+
+        if not self.path and self.current_target == getattr(self.destination, "coordinates", None):
+            # Leaving a settlement's entry tile: follow the planned route
+            route = world.routes.route_from(world, self.coordinates, self.destination)
+            if route and len(route) > 1:
+                self.route, self.route_index = route, 1
+                return self.approach_target(world)
+
         if not self.path and self.current_target:
             # Caravans don't know if their destination is alive
             self.path = self.find_path(self.current_target, world)
@@ -90,6 +103,7 @@ class Caravan(Mobile, Thinking):
 
                 if closest_settlement:
                     self.current_target = closest_settlement.coordinates
+                    self.route, self.route_index = (), 0
 
         elif self.state == "fleeing":
             self.life -= 1
@@ -103,10 +117,28 @@ class Caravan(Mobile, Thinking):
             else:
                 self.die(world, "success")
 
-    def serialize(self) -> Dict[str, Any]:
+    def next_wake(self, world) -> Optional[int]:
+        if self.state == "trading" and self.loiter_counter > 0:
+            return self.loiter_counter + 1
+        if self.state == "moving" and not self.is_nearby_target(world):
+            return super().next_wake(world)
+        return 1
+
+    def skip(self, ticks: int) -> None:
+        if self.state == "trading":
+            self.loiter_counter -= ticks
+        else:
+            super().skip(ticks)
+
+    def watches(self) -> Iterable[Entity]:
+        return (self.destination,) if isinstance(self.destination, Entity) else ()
+
+    def _serialize(self) -> Dict[str, Any]:
         """Serialize caravan to dictionary for JSON output."""
-        data = super().serialize()
-        data["home"] = self.home.name
+        data = super()._serialize()
+        data["home"] = self.home.name if self.home else None
         data["destination"] = self.destination.name
-        data["debug_info"] = f"Caravan at {self.coordinates} heading to {self.current_target} home: {self.home.name}, destination: {self.destination.name}, state {self.state}, loiter_counter {self.loiter_counter}, path {len(self.path)}"
-        return data
\ No newline at end of file
+        return data
+
+    def describe(self) -> str:
+        return f"Caravan at {self.coordinates} heading to {self.current_target} home: {self.home.name if self.home else None}, destination: {self.destination.name}, state {self.state}, loiter_counter {self.loiter_counter}, path {len(self.path)}"
\ No newline at end of file
@@ -1,9 +1,13 @@
 from entities.base.mobile import Mobile
 from entities.base.entity import Coordinates
-from entities.base.settlement import Settlement
-import random
+
+TARGET_ATTEMPTS = 20  # Tiles tried before grazing in place for another tick
 
 class Cattle(Mobile):
+
+    __slots__ = ("path", "target")
+
+    loiter = 10
     
     def __init__(
         self,
@@ -11,28 +15,14 @@ class Cattle(Mobile):
         coordinates: Coordinates,
         life: int,
     ):
-        super().__init__(color, 'ɤ', coordinates, life, state="grazing", intent="foraging")
-        self.loiter = 10
+        super().__init__(color, 'ɤ', coordinates, life)
+        self.state = "grazing"
         self.path: list[Coordinates] = []  # Current path to follow
+        self.target: Coordinates = None
     
     def is_passable(self, coordinates: Coordinates, world) -> bool:
         """Check if a tile is passable (field or open area, not through settlements)."""
-        
-        x, y = coordinates
-        if x < 0 or y < 0 or x >= len(world.height_map[0]) or y >= len(world.height_map):
-            return False  # Out of bounds
-        
-        height = world.height_map[y][x]
-        
-        if world.get_biome_from_height(height) != 'field':
-            return False
-        
-        # Check if any settlement occupies this tile
-        for entity in world.entities if hasattr(world, 'entities') else []:
-            if isinstance(entity, Settlement) and entity.occupies(coordinates):
-                return False
-        
-        return True
+        return world.is_open(coordinates)
     
     def choose_target(self, world) -> None:
         """Choose a target: near nearby settlement if within 10 units, else wander randomly."""
@@ -45,25 +35,33 @@ class Cattle(Mobile):
                     nearby_settlement = entity
                     break
         
-        while True:
+        rng = world.rng("cattle")
+        for _ in range(TARGET_ATTEMPTS):
             if nearby_settlement:
                 # Stay within 5 units of settlement
                 settlement_x, settlement_y = nearby_settlement.coordinates
-                dx = random.randint(3, 6) * random.choice([-1, 1])
-                dy = random.randint(3, 6) * random.choice([-1, 1])
+                dx = rng.randint(3, 6) * rng.choice([-1, 1])
+                dy = rng.randint(3, 6) * rng.choice([-1, 1])
                 target = (settlement_x + dx, settlement_y + dy)
             else:
                 # Wander randomly
                 current_x, current_y = self.coordinates
-                dx = random.randint(-10, 10)
-                dy = random.randint(-10, 10)
+                dx = rng.randint(-10, 10)
+                dy = rng.randint(-10, 10)
                 target = (current_x + dx, current_y + dy)
             
             if self.is_passable(target, world):
                 break
+        else:
+            return  # Hemmed in, try again next tick
         
         self.set_target(target)
         self.path = self.find_path(target, world)
+        self.state = "moving" if self.path else "grazing"
+
+    def set_target(self, target: Coordinates) -> None:
+        self.target = target
+        self.destination = target
     
     def approach_target(self, world) -> None:
         """Move one step along the path to the target."""
@@ -77,4 +75,6 @@ class Cattle(Mobile):
             self.move_to(next_step)
     
     def update(self, world) -> None:
+        if self.state in ("grazing", "arrived"):
+            self.choose_target(world)
         super().update(world)
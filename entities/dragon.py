@@ -1,8 +1,7 @@
 from math import atan2, degrees
-from random import randint
-from typing import TYPE_CHECKING, Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, NamedTuple, Optional, Tuple
 from entities.base.mobile import Mobile
-from entities.base.entity import Coordinates
+from entities.base.entity import Coordinates, Entity
 from entities.base.named import Named
 from entities.base.thinking import Thinking
 
@@ -12,56 +11,61 @@ if TYPE_CHECKING:
 
 
 
+class DragonKind(NamedTuple):
+    """Per-type data shared by every dragon of that type."""
+    type: str
+    chars: Tuple[str, str]
+    base_rotation: int
+
+
+# Checked in order; the first property a dragon has decides its type
+DRAGON_KINDS = (
+    DragonKind("serpent", ('Ȿ', 'Ɀ'), 270),  # faces up
+    DragonKind("brute", ('&', 'Ֆ'), 270),  # faces left up
+    DragonKind("blade", ('%', '÷'), 315),  # faces right up
+    DragonKind("druid", ('₷', '₻'), 315),  # faces right up
+    DragonKind("midas", ('ꬸ', 'ꬷ'), 270),  # faces up
+)
+
+DOMAIN_COLORS = {
+    "aquatic": "#004080",
+    "mountain": "#808080",
+    "verdant": "#008000",
+    "flame": "#800000",
+}
+
+
 class Dragon(Mobile, Named, Thinking):
 
+    __slots__ = ("name", "thoughts", "thought_count", "intent", "kind", "domain", "target", "move_error", "rotation")
+
+    SERIALIZED_FIELDS = Mobile.SERIALIZED_FIELDS | {"name", "type", "domain", "rotation", "target"}
+
     def __init__(
         self,
         name: str,
         properties: list[str],
         coordinates: Coordinates,
     ):
-        if "serpent" in properties:
-            chars = ['Ȿ', 'Ɀ']
-            self.type = "serpent"
-            base_rotation = 270  # faces up
-        elif "brute" in properties:
-            chars = ['&', 'Ֆ']
-            self.type = "brute"
-            base_rotation = 270  # faces left up
-        elif "blade" in properties:
-            chars = ['%', '÷']
-            self.type = "blade"
-            base_rotation = 315  # faces right up
-        elif "druid" in properties:
-            chars = ['₷', '₻']
-            self.type = "druid"
-            base_rotation = 315  # faces right up
-        elif "midas" in properties:
-            chars = ['ꬸ', 'ꬷ']
-            self.type = "midas"
-            base_rotation = 270  # faces up
-        
-        if "aquatic" in properties:
-            color = "#004080"
-            self.domain = "aquatic"
-        elif "mountain" in properties:
-            color = "#808080"
-            self.domain = "mountain"
-        elif "verdant" in properties:
-            color = "#008000"
-            self.domain = "verdant"
-        elif "flame" in properties:
-            color = "#800000"
-            self.domain = "flame"
-
-
-        Mobile.__init__(self, color, chars[0], coordinates, 500)
+        kind = next(kind for kind in DRAGON_KINDS if kind.type in properties)
+        domain = next(domain for domain in DOMAIN_COLORS if domain in properties)
+
+        Mobile.__init__(self, DOMAIN_COLORS[domain], kind.chars[0], coordinates, 500)
         Named.__init__(self, name)
         Thinking.__init__(self)
-        self.loiter = 0
+        self.kind = kind
+        self.domain = domain
+        self.target = None
         self.move_error = 0.0  # Track error for line approximation
-        self.base_rotation = base_rotation
-        self.rotation = base_rotation  # Current rotation angle in degrees
+        self.rotation = kind.base_rotation  # Current rotation angle in degrees
+
+    @property
+    def type(self) -> str:
+        return self.kind.type
+
+    @property
+    def base_rotation(self) -> int:
+        return self.kind.base_rotation
     
     def choose_target(self, world) -> None:
         pass
@@ -73,6 +77,8 @@ class Dragon(Mobile, Named, Thinking):
             return
         
         # Handle both entity targets and coordinate targets
+        if isinstance(self.target, Entity):
+            self.target.sync()  # A dragon target may be skipping ticks of flight
         if hasattr(self.target, 'coordinates'):
             target_coords = self.target.coordinates
         else:
@@ -139,15 +145,46 @@ class Dragon(Mobile, Named, Thinking):
 
         if self.state == "arrived":
             self.state = "moving"
-            self.target = world.entities[randint(0, len(world.entities) - 1)]
+            self.target = world.entities[world.rng("dragon").randint(0, len(world.entities) - 1)]
+
+    def _straight_flight(self) -> Optional[Tuple[int, int, int]]:
+        """(step x, step y, steps left) while flying along an axis to a target that cannot move."""
+        if self.state != "moving" or self.loiter_counter < self.loiter or isinstance(self.target, Mobile):
+            return None
+        if self.target is None:
+            return None
+        target_coords = self.target.coordinates if hasattr(self.target, 'coordinates') else self.target
+        dx = target_coords[0] - self.coordinates[0]
+        dy = target_coords[1] - self.coordinates[1]
+        if dx and dy or not (dx or dy):
+            return None  # Diagonal flights accumulate error and movement debt; step those
+        return (dx > 0) - (dx < 0), (dy > 0) - (dy < 0), abs(dx + dy)
 
-    def serialize(self) -> Dict[str, Any]:
+    def next_wake(self, world) -> Optional[int]:
+        if world.catching_up:
+            flight = self._straight_flight()
+            if flight is not None:
+                return flight[2] + 1  # The tick after the last step finds the target reached
+        return super().next_wake(world)
+
+    def skip(self, ticks: int) -> None:
+        flight = self._straight_flight()
+        if flight is None:
+            super().skip(ticks)
+            return
+        step_x, step_y, _ = flight
+        self.coordinates = (self.coordinates[0] + step_x * ticks, self.coordinates[1] + step_y * ticks)
+        self.rotation = degrees(atan2(step_y, step_x)) - self.base_rotation
+
+    def _serialize(self) -> Dict[str, Any]:
         """Serialize dragon to dictionary for JSON output."""
-        data = super().serialize()
+        data = super()._serialize()
         data["name"] = self.name
         data["type"] = self.type
         data["domain"] = self.domain
         data["rotation"] = self.rotation
         data["target"] = self.target.name if hasattr(self.target, 'name') else self.target.coordinates
-        data["debug_info"] = f"{self.name} type {self.type} rotation {self.rotation:.1f}°"
         return data
+
+    def describe(self) -> str:
+        return f"{self.name} type {self.type} rotation {self.rotation:.1f}°"
@@ -1,5 +1,5 @@
 """Spirit base class - stationary entities with domain areas."""
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from entities.base.entity import Entity, Coordinates
 
 
@@ -14,6 +14,10 @@ TENDED_RECOVERY_RATE = 3
 
 class Spirit(Entity):
 
+    __slots__ = ("type", "domain_area", "max_life", "attending_dragons", "domain_tiles")
+
+    SERIALIZED_FIELDS = Entity.SERIALIZED_FIELDS | {"type", "life", "max_life", "domain_area", "domain_tiles"}
+
     def __init__(
         self,
         type: str,
@@ -31,8 +35,10 @@ class Spirit(Entity):
     
     def life_depletion_on_use(self, amount: int) -> None:
         """Deplete life when the spirit is used/exploited."""
+        self.sync()
         self.life = max(0, self.life - amount)
         self._update_domain_area()
+        self.wake()
     
     def natural_recovery(self) -> None:
         """Recover life naturally over time."""
@@ -56,10 +62,25 @@ class Spirit(Entity):
         
         if not self.attending_dragons:
             self.natural_recovery()
+
+    def next_wake(self, world) -> Optional[int]:
+        # Recovery at full life changes nothing; call wake() after attending a dragon
+        if self.attending_dragons or self.domain_area < 1:
+            return 1
+        if self.life < self.max_life and not world.catching_up:
+            return 1
+        return None
+
+    def skip(self, ticks: int) -> None:
+        # Only recovery can have been skipped, and only until life is full
+        if not self.attending_dragons:
+            missing = self.max_life - self.life
+            for _ in range(min(ticks, -(-missing // NATURAL_RECOVERY_RATE))):
+                self.natural_recovery()
     
-    def serialize(self):
+    def _serialize(self):
         """Serialize spirit to dictionary for JSON output."""
-        base = super().serialize()
+        base = super()._serialize()
         base.update({
             "type": self.type,
             "life": self.life,
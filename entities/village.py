@@ -1,58 +1,57 @@
 """Village settlement."""
 from entities.base.settlement import Settlement
 from entities.base.entity import Coordinates
-from typing import List, Tuple, TYPE_CHECKING
+from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from entities.city import City
 
 
 class Village(Settlement):
-    """3x3 village with fields, homes, and city square."""
-    
+    """3x3 village with fields, homes, and city square.
+
+    Layout (coordinates at city square ¤):
+    #⌂#
+    ⌂¤⌂
+    #₼#
+    """
+
+    __slots__ = ()
+
+    TILES = (
+        (-1, -1, "#", "#FFD700"),  # Top left field (yellow)
+        (0, -1, "⌂", "#8B4513"),  # Top home (brown)
+        (1, -1, "#", "#FFD700"),  # Top right field
+
+        (-1, 0, "⌂", "#8B4513"),  # Middle left home
+        (0, 0, "¤", "#808080"),  # City square (grey)
+        (1, 0, "⌂", "#8B4513"),  # Middle right home
+
+        (-1, 1, "#", "#FFD700"),  # Bottom left field
+        (0, 1, "₼", "#808080"),  # Gate (grey)
+        (1, 1, "#", "#FFD700"),  # Bottom right field
+    )
+    DEPLETED_TILES = (
+        # Depleted village: loses fields (corners become empty), houses become dark grey
+        # Corners (former fields) are now empty - no tiles
+        (0, -1, "⌂", "#505050"),  # Top home (dark grey)
+
+        (-1, 0, "⌂", "#505050"),  # Middle left home
+        (0, 0, "¤", "#808080"),  # City square (grey)
+        (1, 0, "⌂", "#505050"),  # Middle right home
+
+        (0, 1, "₼", "#808080"),  # Gate (grey)
+    )
+
     def __init__(self, name: str, coordinates: Coordinates):
         super().__init__(name, coordinates, life=500, settlement_type="village")
-        
-    def get_tiles(self) -> List[Tuple[Coordinates, str, str]]:
-        """Return all 3x3 tiles for the village.
-        Layout (coordinates at city square ¤):
-        #⌂#
-        ⌂¤⌂
-        #₼#
-        """
-        x, y = self.coordinates  # City square position
-        
-        if self.is_dead:
-            # Depleted village: loses fields (corners become empty), houses become dark grey
-            return [
-                # Corners (former fields) are now empty - no tiles
-                ((x, y - 1), "⌂", "#505050"),  # Top home (dark grey)
-                
-                ((x - 1, y), "⌂", "#505050"),      # Middle left home
-                ((x, y), "¤", "#808080"),  # City square (grey)
-                ((x + 1, y), "⌂", "#505050"),  # Middle right home
-                
-                ((x, y + 1), "₼", "#808080"),  # Gate (grey)
-            ]
-        else:
-            # Normal village
-            return [
-                ((x - 1, y - 1), "#", "#FFD700"),      # Top left field (yellow)
-                ((x, y - 1), "⌂", "#8B4513"),  # Top home (brown)
-                ((x + 1, y - 1), "#", "#FFD700"),  # Top right field
-                
-                ((x - 1, y), "⌂", "#8B4513"),      # Middle left home
-                ((x, y), "¤", "#808080"),  # City square (grey)
-                ((x + 1, y), "⌂", "#8B4513"),  # Middle right home
-                
-                ((x - 1, y + 1), "#", "#FFD700"),      # Bottom left field
-                ((x, y + 1), "₼", "#808080"),  # Gate (grey)
-                ((x + 1, y + 1), "#", "#FFD700"),  # Bottom right field
-            ]
-    
+
     def promote_to_city(self) -> 'City':
         """Promote this village to a city."""
         from entities.city import City
         city = City(self.name, self.coordinates)
         city.life = self.life
+        for thought in self.thoughts:
+            city.think(thought)
+        city.thought_count = self.thought_count
         return city
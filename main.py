@@ -1,9 +1,11 @@
-from flask import Flask, request
-from endpoints import api_bp, endpoints_bp
-from entities.dragon import Dragon
+import os
+import tempfile
+import threading
+from flask import Flask
+from endpoints import api_bp, endpoints_bp, recordings_bp, init_compression, init_memory_debug, init_metrics, init_static_assets
 from world import World
-from entities import Camp, Village, City
-from collections import defaultdict
+from world.demo import create_world
+from world.manager import MAX_LOADED, MAX_WORLDS, WorldManager
 #import firebase_admin
 #from firebase_admin import credentials
 
@@ -11,63 +13,60 @@ from collections import defaultdict
 #firebase_admin.initialize_app(cred)
 
 
-app = Flask(__name__)
-
-world = World()
-app.world = world  # Make world accessible to blueprints
-
-# Add some example settlements to demonstrate the new system
-worker_camp = Camp("Mining Camp", (20, 20))
-village = Village("Riverside", (30, 30))
-city = City("Capital", (50, 50))
-
-# Add a depleted village to show the depleted state
-depleted_village = Village("Abandoned Hamlet", (70, 70))
-depleted_village.life = 0
-depleted_village.die(world, "hunger")
-
-world.add_entity(worker_camp)
-world.add_entity(village)
-world.add_entity(city)
-world.add_entity(depleted_village)
-
-dragon1 = Dragon("Jielle", ["serpent", "aquatic"], (180, 180))
-dragon2 = Dragon("Thrax", ["brute", "mountain"], (20, 200))
-dragon3 = Dragon("Sylph", ["blade", "verdant"], (10, 30))
-dragon4 = Dragon("Ember", ["druid", "flame"], (10, 50))
-dragon5 = Dragon("Aurelia", ["midas", "mountain"], (25, 25))
-
-dragon1.target = worker_camp
-dragon2.target = worker_camp
-dragon3.target = village
-dragon4.target = village
-dragon5.target = city
-
-dragon1.state = "moving"
-dragon2.state = "moving"
-dragon3.state = "moving"
-dragon4.state = "moving"
-dragon5.state = "moving"
-
-world.add_entity(dragon1)
-world.add_entity(dragon2)
-world.add_entity(dragon3)
-world.add_entity(dragon4)
-world.add_entity(dragon5)
-
-world.start_update_thread()
-
-# Dictionary to store endpoint access statistics
-endpoint_stats = defaultdict(int)
-app.endpoint_stats = endpoint_stats
-
-# Middleware to log endpoint access
-@app.before_request
-def log_endpoint_access():
-    # Exclude static files
-    if not (request.path.startswith('/static/') or request.path.startswith('/api/')):
-        endpoint_stats[request.path] += 1
-
+class HereBe(Flask):
+    """Flask app that builds the world on first use rather than at import.
+
+    Pages that never touch the world (/notes, /names, ...) answer without
+    paying for terrain generation, which matters on serverless cold starts.
+
+    With WORLD_MODE=shared the workers simulate nothing themselves and attach
+    to the world published by `python -m world.simulator` instead.
+
+    Further worlds are hosted by id under /world/<id> and /api/world/<id>;
+    WORLD_MEMORY_BUDGET (MiB) and WORLD_MAX_LOADED bound the ones simulating,
+    WORLD_SNAPSHOT_DIR holds the ones unloaded to disk and WORLD_MAX_COUNT
+    caps how many exist at all.
+    """
+
+    _world = None
+    _world_lock = threading.Lock()
+    _worlds = None
+
+    @property
+    def world(self) -> World:
+        if self._world is None:
+            with self._world_lock:
+                if self._world is None:
+                    if os.environ.get("WORLD_MODE") == "shared":
+                        from world.shared import DEFAULT_NAME, SharedWorldView
+                        world = SharedWorldView(os.environ.get("WORLD_SHM_NAME", DEFAULT_NAME))
+                    else:
+                        world = create_world()
+                    world.start_update_thread()
+                    self._world = world
+        return self._world
+
+    @property
+    def worlds(self) -> WorldManager:
+        if self._worlds is None:
+            with self._world_lock:
+                if self._worlds is None:
+                    self._worlds = WorldManager(
+                        os.environ.get("WORLD_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "here-be-worlds")),
+                        int(os.environ.get("WORLD_MEMORY_BUDGET", 256)) << 20,
+                        int(os.environ.get("WORLD_MAX_LOADED", MAX_LOADED)),
+                        int(os.environ.get("WORLD_MAX_COUNT", MAX_WORLDS)),
+                    )
+        return self._worlds
+
+
+app = HereBe(__name__)
 
 app.register_blueprint(api_bp)
-app.register_blueprint(endpoints_bp)
\ No newline at end of file
+app.register_blueprint(endpoints_bp)
+app.register_blueprint(recordings_bp)
+init_memory_debug(app)  # Only with DEBUG_MEMORY=1
+# Registered first so its after_request hook runs last and times compression too
+init_metrics(app)
+init_compression(app)
+init_static_assets(app)
\ No newline at end of file
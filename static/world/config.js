@@ -6,6 +6,9 @@ export const HEIGHT = 200;
 export const CELL_WIDTH = 12;
 export const CELL_HEIGHT = 12;
 
+// Biome names in the order of the server's biome codes
+export const BIOMES = ['water', 'field', 'forest', 'mountain'];
+
 // Biome color mapping
 export const BIOME_COLORS = {
     water: { fg: '#4da6ff', bg: '#161664' },
@@ -20,5 +23,6 @@ export const displayOptions = {
     terrainBg: true,
     entityGlow: true,
     entityAnimation: true,
-    showEntities: true
+    showEntities: true,
+    overview: true
 };
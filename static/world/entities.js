@@ -6,6 +6,15 @@ let entityCanvas, entityCtx;
 // Store entity data
 export let entityMap = new Map();
 
+// Entities by id, patched in place by delta responses
+const entityStore = new Map();
+let lastUpdateCount = null;
+
+// Tiles of extra entities fetched around the visible area
+const VIEWPORT_MARGIN = 10;
+let requestedViewport = null;
+let streamSource = null;
+
 // Animation tracking
 let pulsePhase = 0;
 let lastPulseTime = 0;
@@ -91,43 +100,184 @@ export function renderEntities(timestamp) {
     });
 }
 
+// Decode a columnar entity block (see endpoints/columnar.py) into entity objects
+export function decodeColumns(block, width) {
+    const { count, dictionaries, columns } = block;
+    const entities = Array.from({ length: count }, () => ({}));
+    const unpack = (position) => [position % width, Math.floor(position / width)];
+    
+    Object.entries(columns).forEach(([field, values]) => {
+        const dictionary = dictionaries[field];
+        for (let i = 0; i < count; i++) {
+            const value = values[i];
+            if (value === null) continue;
+            
+            if (field === 'position') {
+                entities[i].coordinates = unpack(value);
+            } else if (field === 'domain_tiles') {
+                entities[i].domain_tiles = value.map(unpack);
+            } else if (field === 'tiles') {
+                const tiles = [];
+                for (let t = 0; t < value.length; t += 3) {
+                    tiles.push([unpack(value[t]), dictionaries.character[value[t + 1]], dictionaries.color[value[t + 2]]]);
+                }
+                entities[i].tiles = tiles;
+            } else {
+                entities[i][field] = dictionary ? dictionary[value] : value;
+            }
+        }
+    });
+    return entities;
+}
+
+// Apply a keyframe or delta payload from the server to the entity store
+export function applyWorldPayload(data) {
+    if (data.format === 'columnar') {
+        ['entities', 'added', 'changed'].forEach(key => {
+            if (data[key]) data[key] = decodeColumns(data[key], data.width);
+        });
+    }
+    
+    if (data.keyframe) {
+        entityStore.clear();
+        data.entities.forEach(entity => entityStore.set(entity.id, entity));
+    } else {
+        data.added.forEach(entity => entityStore.set(entity.id, entity));
+        data.changed.forEach(entity => entityStore.set(entity.id, entity));
+        data.removed.forEach(id => entityStore.delete(id));
+    }
+    lastUpdateCount = data.update_count;
+    rebuildEntityMap();
+}
+
+// Rebuild the per-tile lookup from the entity store
+function rebuildEntityMap() {
+    entityMap.clear();
+    
+    entityStore.forEach(entity => {
+        if (entity.tiles && Array.isArray(entity.tiles)) {
+            entity.tiles.forEach(tile => {
+                const [coords, symbol, color] = tile;
+                const [x, y] = coords;
+                if (x >= 0 && x < WIDTH && y >= 0 && y < HEIGHT) {
+                    entityMap.set(`${x},${y}`, {
+                        ...entity,
+                        coordinates: coords,
+                        character: symbol,
+                        color: color
+                    });
+                }
+            });
+        } else {
+            const [x, y] = entity.coordinates;
+            if (x >= 0 && x < WIDTH && y >= 0 && y < HEIGHT) {
+                entityMap.set(`${x},${y}`, entity);
+            }
+        }
+    });
+}
+
+// Visible tile rectangle [x0, y0, x1, y1] of the entity canvas
+function currentViewport() {
+    const rect = entityCanvas.getBoundingClientRect();
+    return [
+        Math.max(0, Math.floor(-rect.left / CELL_WIDTH)),
+        Math.max(0, Math.floor(-rect.top / CELL_HEIGHT)),
+        Math.min(WIDTH - 1, Math.ceil((window.innerWidth - rect.left) / CELL_WIDTH)),
+        Math.min(HEIGHT - 1, Math.ceil((window.innerHeight - rect.top) / CELL_HEIGHT))
+    ];
+}
+
+// Whether the last requested viewport (with half its margin) still covers the view
+function viewportCovered(viewport) {
+    if (!requestedViewport) return false;
+    const slack = VIEWPORT_MARGIN / 2;
+    return viewport[0] >= requestedViewport[0] - slack
+        && viewport[1] >= requestedViewport[1] - slack
+        && viewport[2] <= requestedViewport[2] + slack
+        && viewport[3] <= requestedViewport[3] + slack;
+}
+
+function viewportQuery() {
+    return `format=columnar&viewport=${requestedViewport.join(',')}&margin=${VIEWPORT_MARGIN}`;
+}
+
 // Fetch and update entities
 export async function updateEntities() {
     const startTime = performance.now();
     try {
-        const response = await fetch('/api/world');
-        const data = await response.json();
+        const viewport = currentViewport();
+        if (!viewportCovered(viewport)) {
+            // Panned outside the fetched area: start over with a keyframe
+            requestedViewport = viewport;
+            lastUpdateCount = null;
+        }
         
-        entityMap.clear();
+        const since = lastUpdateCount === null ? '' : `&since=${lastUpdateCount}`;
+        const response = await fetch(`${worldApi.world}?${viewportQuery()}${since}`);
+        const data = await response.json();
         
-        if (data.entities) {
-            data.entities.forEach(entity => {
-                if (entity.tiles && Array.isArray(entity.tiles)) {
-                    entity.tiles.forEach(tile => {
-                        const [coords, symbol, color] = tile;
-                        const [x, y] = coords;
-                        if (x >= 0 && x < WIDTH && y >= 0 && y < HEIGHT) {
-                            entityMap.set(`${x},${y}`, {
-                                ...entity,
-                                coordinates: coords,
-                                character: symbol,
-                                color: color
-                            });
-                        }
-                    });
-                } else {
-                    const [x, y] = entity.coordinates;
-                    if (x >= 0 && x < WIDTH && y >= 0 && y < HEIGHT) {
-                        entityMap.set(`${x},${y}`, entity);
-                    }
-                }
-            });
-        }
+        applyWorldPayload(data);
         
         const endTime = performance.now();
-        console.log(`updateEntities completed in ${(endTime - startTime).toFixed(2)}ms (${entityMap.size} tiles)`);
+        const kind = data.keyframe ? 'keyframe' : 'delta';
+        console.log(`updateEntities (${kind}) completed in ${(endTime - startTime).toFixed(2)}ms (${entityMap.size} tiles)`);
         
     } catch (error) {
         console.error('Failed to fetch world data:', error);
     }
 }
+
+// Poll the world endpoint for deltas once per second
+function startPolling() {
+    streamSource = null;
+    updateEntities();
+    setInterval(updateEntities, 1000);
+}
+
+// Open the tick stream for the current viewport
+function openStream() {
+    requestedViewport = currentViewport();
+    const source = new EventSource(`${worldApi.world}/stream?${viewportQuery()}`);
+    source.onmessage = (event) => applyWorldPayload(JSON.parse(event.data));
+    source.onerror = () => {
+        console.warn('World stream unavailable, falling back to polling');
+        source.close();
+        startPolling();
+    };
+    streamSource = source;
+}
+
+// Play a recording; its stream holds the whole world, so panning never reopens it
+function openPlayback() {
+    const source = new EventSource(worldApi.stream);
+    source.onmessage = (event) => applyWorldPayload(JSON.parse(event.data));
+    // Closing on end or error stops EventSource from replaying from the start
+    source.addEventListener('end', () => source.close());
+    source.onerror = () => source.close();
+}
+
+// Receive ticks over server-sent events, falling back to polling
+export function startEntityUpdates() {
+    if (worldApi.playback) {
+        openPlayback();
+        return;
+    }
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+    openStream();
+}
+
+// Re-query when the view pans outside the fetched area
+export function refreshViewport() {
+    if (worldApi.playback || viewportCovered(currentViewport())) return;
+    if (streamSource) {
+        streamSource.onerror = null;
+        streamSource.close();
+        openStream();
+    } else {
+        updateEntities();
+    }
+}
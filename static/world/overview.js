@@ -0,0 +1,127 @@
+import { WIDTH, HEIGHT, CELL_WIDTH, CELL_HEIGHT, BIOMES, BIOME_COLORS, displayOptions } from './config.js';
+import { loadTerrainLevel } from './terrain.js';
+
+// Overview size in pixels, and the smallest cell worth drawing
+const OVERVIEW_SIZE = 200;
+const MIN_CELL_PIXELS = 2;
+
+// Tiles across the overview, halved or doubled by the wheel
+const MIN_SPAN = 25;
+const MAX_SPAN = Math.max(WIDTH, HEIGHT);
+
+let overviewCanvas, overviewCtx, mapCanvas;
+let span = MAX_SPAN;
+let shown = null;  // Tile region [x, y, w, h] the overview covers
+let terrain = null;  // Last level fetched for `shown`
+let requested = null;
+
+export function initOverview() {
+    overviewCanvas = document.getElementById('overviewCanvas');
+    overviewCanvas.width = OVERVIEW_SIZE;
+    overviewCanvas.height = OVERVIEW_SIZE;
+    overviewCtx = overviewCanvas.getContext('2d');
+    mapCanvas = document.getElementById('backgroundCanvas');
+    
+    overviewCanvas.addEventListener('wheel', (e) => {
+        e.preventDefault();
+        const next = e.deltaY > 0 ? Math.min(MAX_SPAN, span * 2) : Math.max(MIN_SPAN, span / 2);
+        if (next !== span) {
+            span = next;
+            refreshOverview();
+        }
+    }, { passive: false });
+    overviewCanvas.addEventListener('click', (e) => {
+        if (!shown) return;
+        const rect = overviewCanvas.getBoundingClientRect();
+        const tilesPerPixel = shown[2] / OVERVIEW_SIZE;
+        centerOn(shown[0] + (e.clientX - rect.left) * tilesPerPixel, shown[1] + (e.clientY - rect.top) * tilesPerPixel);
+    });
+    refreshOverview();
+}
+
+export function setOverviewVisible(visible) {
+    displayOptions.overview = visible;
+    overviewCanvas.style.display = visible ? '' : 'none';
+    if (visible) refreshOverview();
+}
+
+// Tiles currently in the browser window, as [x, y, w, h]
+function visibleTiles() {
+    const rect = mapCanvas.getBoundingClientRect();
+    const x = Math.max(0, -rect.left / CELL_WIDTH);
+    const y = Math.max(0, -rect.top / CELL_HEIGHT);
+    return [
+        x, y,
+        Math.min(WIDTH, (window.innerWidth - rect.left) / CELL_WIDTH) - x,
+        Math.min(HEIGHT, (window.innerHeight - rect.top) / CELL_HEIGHT) - y
+    ];
+}
+
+// Scroll the main view so that tile (x, y) is in the middle of the window
+function centerOn(x, y) {
+    const rect = mapCanvas.getBoundingClientRect();
+    window.scrollTo(
+        window.scrollX + rect.left + x * CELL_WIDTH - window.innerWidth / 2,
+        window.scrollY + rect.top + y * CELL_HEIGHT - window.innerHeight / 2
+    );
+}
+
+// The span x span tiles around the view, snapped to a quarter span so small scrolls reuse the fetched level
+function overviewRegion(view) {
+    const step = Math.ceil(span / 4);
+    const clampStart = (start, size) => Math.min(Math.max(0, size - span), Math.max(0, start));
+    const snap = (center) => Math.round((center - span / 2) / step) * step;  // Whole tiles, as the server expects
+    return [
+        clampStart(snap(view[0] + view[2] / 2), WIDTH),
+        clampStart(snap(view[1] + view[3] / 2), HEIGHT),
+        Math.min(span, WIDTH),
+        Math.min(span, HEIGHT)
+    ];
+}
+
+// Fetch the level for the current zoom if the covered region changed, then redraw
+export async function refreshOverview() {
+    if (!overviewCtx || !displayOptions.overview) return;
+    const view = visibleTiles();
+    const region = overviewRegion(view);
+    const key = region.join(',');
+    
+    if (key !== requested) {
+        requested = key;
+        const scale = span / OVERVIEW_SIZE * MIN_CELL_PIXELS;
+        const level = await loadTerrainLevel(worldSeed, scale, region);
+        if (requested !== key) return;  // A newer region was requested meanwhile
+        shown = region;
+        terrain = level;
+    }
+    drawOverview(view);
+}
+
+function drawOverview(view) {
+    overviewCtx.clearRect(0, 0, OVERVIEW_SIZE, OVERVIEW_SIZE);
+    if (!terrain) return;
+    
+    // Only the cells of the shown region were transferred; draw each as one rectangle
+    const pixelsPerTile = OVERVIEW_SIZE / shown[2];
+    const cellPixels = terrain.cell * pixelsPerTile;
+    const [cellX, cellY, cellsWide, cellsHigh] = terrain.region;
+    for (let row = 0; row < cellsHigh; row++) {
+        for (let column = 0; column < cellsWide; column++) {
+            overviewCtx.fillStyle = BIOME_COLORS[BIOMES[terrain.biomes[row * cellsWide + column]]].bg;
+            overviewCtx.fillRect(
+                ((cellX + column) * terrain.cell - shown[0]) * pixelsPerTile,
+                ((cellY + row) * terrain.cell - shown[1]) * pixelsPerTile,
+                Math.ceil(cellPixels), Math.ceil(cellPixels)
+            );
+        }
+    }
+    
+    // Outline what the main view shows
+    overviewCtx.strokeStyle = '#ffaa00';
+    overviewCtx.strokeRect(
+        (view[0] - shown[0]) * pixelsPerTile + 0.5,
+        (view[1] - shown[1]) * pixelsPerTile + 0.5,
+        view[2] * pixelsPerTile,
+        view[3] * pixelsPerTile
+    );
+}
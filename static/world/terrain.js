@@ -10,6 +10,38 @@ let terrainFrame1, terrainFrame1Ctx;
 let terrainData = [];
 let terrainAnimPhase = 0;
 
+// Fetch the quantized heightmap and decode it into rows of a Float32Array
+export async function loadHeightMap(seed) {
+    const response = await fetch(`${worldApi.terrain}?seed=${seed}&format=u16`);
+    const samples = new Uint16Array(await response.arrayBuffer());
+    const [, , width, height] = response.headers.get('X-Terrain-Region').split(',').map(Number);
+    
+    const heights = new Float32Array(samples.length);
+    for (let i = 0; i < samples.length; i++) {
+        heights[i] = samples[i] / 65535;
+    }
+    
+    // Row views keep the heightMap[y][x] access pattern without copying
+    const rows = [];
+    for (let y = 0; y < height; y++) {
+        rows.push(heights.subarray(y * width, (y + 1) * width));
+    }
+    return rows;
+}
+
+// Fetch one pyramid level for a tile region [x, y, w, h]; `scale` is tiles per drawn cell.
+// Resolves to the level's dominant biome codes with the region they cover, in cells.
+export async function loadTerrainLevel(seed, scale, region) {
+    const [x, y, w, h] = region;
+    const response = await fetch(`${worldApi.terrain}/lod?seed=${seed}&format=biome&scale=${scale}&x=${x}&y=${y}&w=${w}&h=${h}`);
+    return {
+        biomes: new Uint8Array(await response.arrayBuffer()),
+        level: Number(response.headers.get('X-Terrain-Level')),
+        cell: Number(response.headers.get('X-Terrain-Cell')),
+        region: response.headers.get('X-Terrain-Region').split(',').map(Number)
+    };
+}
+
 // Get biome type based on height
 export function getBiomeFromHeight(height) {
     if (height < 0.23) return 'water';
@@ -1,6 +1,7 @@
 import { WIDTH, HEIGHT, CELL_WIDTH, CELL_HEIGHT, displayOptions } from './config.js';
 import { renderTerrain } from './terrain.js';
-import { entityMap } from './entities.js';
+import { entityMap, refreshViewport } from './entities.js';
+import { refreshOverview, setOverviewVisible } from './overview.js';
 
 let terrainCanvas;
 
@@ -9,6 +10,21 @@ export function initUI(canvas, heightMap) {
     terrainCanvas = canvas;
     setupTooltips();
     setupDisplayToggles(heightMap);
+    setupViewportTracking();
+}
+
+// Re-query entities as the view pans or the window resizes
+function setupViewportTracking() {
+    let pending = null;
+    const schedule = () => {
+        clearTimeout(pending);
+        pending = setTimeout(() => {
+            refreshViewport();
+            refreshOverview();
+        }, 200);
+    };
+    window.addEventListener('scroll', schedule, { passive: true });
+    window.addEventListener('resize', schedule);
 }
 
 // Setup tooltip handlers
@@ -40,10 +56,36 @@ function handleMouseMove(event) {
     }
 }
 
+// Debug lines are fetched on demand, cached per entity and tick
+const debugInfo = new Map();
+let hoveredId = null;
+
+async function fetchDebugInfo(entity) {
+    const key = `${entity.id}:${entity.coordinates}`;
+    if (debugInfo.has(key)) return debugInfo.get(key);
+    
+    if (debugInfo.size > 500) debugInfo.clear();
+    debugInfo.set(key, null);
+    const response = await fetch(`${worldApi.entity}/${entity.id}`);
+    const text = response.ok ? (await response.json()).debug_info : '';
+    debugInfo.set(key, text);
+    return text;
+}
+
 // Show tooltip
 function showTooltip(x, y, entity) {
     const tooltip = document.getElementById('tooltip');
-    const text = entity.debug_info;
+    const key = `${entity.id}:${entity.coordinates}`;
+    const text = entity.debug_info ?? debugInfo.get(key) ?? entity.name ?? entity.kind;
+    
+    if (!debugInfo.has(key) && entity.debug_info === undefined) {
+        hoveredId = entity.id;
+        fetchDebugInfo(entity).then(info => {
+            if (hoveredId === entity.id && info && tooltip.style.display === 'block') {
+                tooltip.textContent = info;
+            }
+        });
+    }
     
     tooltip.textContent = text;
     tooltip.style.display = 'block';
@@ -53,6 +95,7 @@ function showTooltip(x, y, entity) {
 
 // Hide tooltip
 function hideTooltip() {
+    hoveredId = null;
     const tooltip = document.getElementById('tooltip');
     tooltip.style.display = 'none';
 }
@@ -91,4 +134,8 @@ function setupDisplayToggles(heightMap) {
             renderTerrain(heightMap);
         }
     });
+    
+    document.getElementById('toggleOverview').addEventListener('change', (e) => {
+        setOverviewVisible(e.target.checked);
+    });
 }
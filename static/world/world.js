@@ -1,6 +1,7 @@
-import { initTerrainCanvases, renderTerrain, renderTerrainChars } from './terrain.js';
-import { initEntityCanvas, renderEntities, updateEntities, entityMap } from './entities.js';
+import { initTerrainCanvases, loadHeightMap, renderTerrain, renderTerrainChars } from './terrain.js';
+import { initEntityCanvas, renderEntities, startEntityUpdates, entityMap } from './entities.js';
 import { initUI } from './ui.js';
+import { initOverview } from './overview.js';
 
 // Main animation loop
 function animate(timestamp) {
@@ -10,10 +11,11 @@ function animate(timestamp) {
 }
 
 // Initialize and start
+const heightMap = await loadHeightMap(worldSeed);
 const terrainCanvas = initTerrainCanvases();
 initEntityCanvas();
 initUI(terrainCanvas, heightMap);
+initOverview();
 renderTerrain(heightMap);
-updateEntities();
+startEntityUpdates();
 requestAnimationFrame(animate);
-setInterval(updateEntities, 1000);
@@ -0,0 +1,24 @@
+"""Worlds shared by the tests."""
+import pickle
+
+import pytest
+
+from world.simulate import populate
+from world.world import World
+
+SEED = 7
+
+
+def build_mixed_world(seed: int = SEED) -> World:
+    """Settlements, dragons, trading caravans and grazing cattle, as `python -m world.simulate` builds them."""
+    world = World(seed)
+    populate(world, villages=2, dragons=20, caravans=10, cattle=15)
+    world.get_changes()
+    return world
+
+
+@pytest.fixture(scope="session")
+def mixed_world():
+    """Make identical copies of one mixed world, built once per session."""
+    initial = pickle.dumps(build_mixed_world())
+    return lambda: pickle.loads(initial)
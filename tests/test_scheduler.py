@@ -0,0 +1,42 @@
+"""The scheduled tick loop must match updating every entity every tick."""
+import random
+
+from entities import Caravan, Cattle, Spirit
+from tests.conftest import SEED
+
+TICKS = 300
+
+
+def test_population_is_mixed(mixed_world):
+    kinds = {type(entity) for entity in mixed_world().entities}
+    assert {Caravan, Cattle, Spirit} <= kinds
+
+
+def test_every_tick_matches(mixed_world):
+    scheduled, every = mixed_world(), mixed_world()
+    every.scheduled = False
+    # Draining spirits at random wakes the dragons and settlements that depend on them
+    events = random.Random(SEED)
+    caravan_states = set()
+    for _ in range(TICKS):
+        drain = events.random() < 0.2
+        index = events.randrange(len(scheduled.entities))
+        for world in (scheduled, every):
+            entity = world.entities[index]
+            if drain and isinstance(entity, Spirit):
+                entity.life_depletion_on_use(5)
+            world.tick()
+        assert scheduled.changes.state == every.changes.state, f"diverged at tick {every.update_count}"
+        caravan_states.update(entity.state for entity in every.entities if isinstance(entity, Caravan))
+    # Trading caravans sleep through their loiter countdown
+    assert "trading" in caravan_states
+
+
+def test_fast_forward_matches_stepping(mixed_world):
+    scheduled, every = mixed_world(), mixed_world()
+    for _ in range(TICKS):
+        every.tick()
+    scheduled.fast_forward(TICKS)
+
+    assert scheduled.update_count == every.update_count
+    assert scheduled.get_changes().state == every.get_changes().state
@@ -0,0 +1,49 @@
+"""Web workers attached to a simulator's shared memory."""
+import os
+from multiprocessing import resource_tracker
+
+import pytest
+
+from main import app
+from tests.conftest import build_mixed_world
+from world.demo import create_world
+from world.shared import SharedWorldPublisher, SharedWorldView
+from world.stats import get_stats
+
+
+@pytest.fixture
+def shared_view(monkeypatch):
+    name = f"here-be-test-{os.getpid()}"
+    world = build_mixed_world()
+    publisher = SharedWorldPublisher(world, name, capacity=1 << 20)
+    publisher.publish(world)
+    with monkeypatch.context() as patch:
+        # The publisher is in this process too, so attaching must keep its registration
+        patch.setattr(resource_tracker, "unregister", lambda *args: None)
+        view = SharedWorldView(name, timeout=1)
+    try:
+        yield view
+    finally:
+        view.close()
+        publisher.close()
+
+
+def test_view_reads_published_state(shared_view):
+    assert shared_view.get_changes().tick is not None
+    assert shared_view.changes.state
+
+
+def test_stats_unavailable_in_shared_mode(shared_view, monkeypatch):
+    assert get_stats(shared_view) is None
+    assert not shared_view.tick_listeners
+    monkeypatch.setattr(app, "_world", shared_view)
+    response = app.test_client().get("/api/stats")
+    assert response.status_code == 404
+
+
+def test_simulator_world_collects_no_stats(monkeypatch):
+    monkeypatch.delenv("WORLD_SNAPSHOT", raising=False)
+    monkeypatch.delenv("WORLD_RECORDING_DIR", raising=False)
+    world = create_world(collect_stats=False)
+    assert getattr(world, "stats", None) is None
+    assert not world.tick_listeners
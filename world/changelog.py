@@ -0,0 +1,143 @@
+"""Bounded history of per-tick entity changes, used to answer delta queries."""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from world.spatial import Bounds, SpatialGrid, footprint, intersects
+
+
+class TickChange(NamedTuple):
+    base: int                       # update_count the change applies on top of
+    tick: int                       # update_count after the change
+    added: frozenset
+    changed: Dict[int, Dict[str, Any]]
+    removed: frozenset
+    previous_bounds: Dict[int, Bounds]  # Footprints at `base` of changed entities
+
+
+class ChangeLog:
+    """Latest serialized state of every entity plus a ring of recent tick changes.
+
+    Clients send the last update_count they saw; anything still inside the ring
+    is answered with a patch, anything older gets a full keyframe. Both can be
+    restricted to a viewport rectangle through the spatial index.
+    """
+
+    def __init__(self, capacity: int = 120):
+        self.capacity = capacity
+        self.tick: Optional[int] = None
+        self.timestamp: Optional[float] = None  # When the latest tick was committed
+        self.state: Dict[int, Dict[str, Any]] = {}
+        self.history: deque = deque(maxlen=capacity)
+        self.index = SpatialGrid()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def commit(self, tick: int, entities: Iterable) -> None:
+        """Serialize entities and record what changed since the previous commit."""
+        self.commit_state(tick, {entity.id: entity.serialize() for entity in entities})
+
+    def commit_state(self, tick: int, state: Dict[int, Dict[str, Any]]) -> None:
+        """Record an already serialized state (id -> entity data) for a tick."""
+        with self._lock:
+            removed = [i for i in self.state if i not in state]
+            self._record(tick, state, removed)
+
+    def commit_changes(self, tick: int, updated: Dict[int, Dict[str, Any]], removed: Iterable[int]) -> None:
+        """Record a tick from only the entities that were touched, O(changes)."""
+        with self._lock:
+            self._record(tick, updated, removed)
+
+    def _record(self, tick: int, updated: Dict[int, Dict[str, Any]], removed: Iterable[int]) -> None:
+        state = self.state
+        # Unchanged entities hand back their cached dict, so identity settles most cases
+        changed = {
+            i: data for i, data in updated.items()
+            if state.get(i) is not data and state.get(i) != data
+        }
+        added = frozenset(i for i in changed if i not in state)
+        removed = frozenset(i for i in removed if i in state)
+
+        previous_bounds = {i: self.index.bounds[i] for i in changed if i in self.index.bounds}
+        for entity_id in removed:
+            self.index.remove(entity_id)
+            del state[entity_id]
+        for entity_id, data in changed.items():
+            self.index.insert(entity_id, footprint(data))
+            state[entity_id] = data
+
+        if self.tick is not None:
+            self.history.append(TickChange(self.tick, tick, added, changed, removed, previous_bounds))
+        self.tick = tick
+        self.timestamp = time.time()
+
+    def keyframe(self, viewport: Optional[Bounds] = None) -> Dict[str, Any]:
+        """Full state of the latest committed tick, optionally inside a viewport."""
+        with self._lock:
+            if viewport is None:
+                entities = list(self.state.values())
+            else:
+                entities = [self.state[i] for i in self.index.query(viewport)]
+            return {
+                "keyframe": True,
+                "update_count": self.tick,
+                "entities": entities,
+            }
+
+    def delta(self, since: int, viewport: Optional[Bounds] = None) -> Optional[Dict[str, Any]]:
+        """Changes between tick `since` and the latest tick, or None if too far behind.
+
+        With a viewport, only entities now inside it are sent; entities that
+        were inside at `since` and have left are reported as removed.
+        """
+        with self._lock:
+            if self.tick is None or since > self.tick:
+                return None
+            if since == self.tick:
+                entries: List[TickChange] = []
+            else:
+                entries = [entry for entry in self.history if entry.base >= since]
+                if not entries or entries[0].base != since:
+                    return None
+
+            added = set()
+            changed: Dict[int, Dict[str, Any]] = {}
+            removed = set()
+            old_bounds: Dict[int, Bounds] = {}
+            for entry in entries:
+                added.update(entry.added)
+                changed.update(entry.changed)
+                for entity_id, bounds in entry.previous_bounds.items():
+                    old_bounds.setdefault(entity_id, bounds)
+                for entity_id in entry.removed:
+                    changed.pop(entity_id, None)
+                    if entity_id in added:
+                        added.discard(entity_id)
+                    else:
+                        removed.add(entity_id)
+
+            if viewport is not None:
+                for entity_id in list(changed):
+                    if intersects(self.index.bounds.get(entity_id), viewport):
+                        continue
+                    del changed[entity_id]
+                    if entity_id not in added and intersects(old_bounds.get(entity_id), viewport):
+                        removed.add(entity_id)
+
+            return {
+                "keyframe": False,
+                "since": since,
+                "update_count": self.tick,
+                "added": [data for i, data in changed.items() if i in added],
+                "changed": [data for i, data in changed.items() if i not in added],
+                "removed": sorted(removed),
+            }
@@ -0,0 +1,74 @@
+"""The demo world served by the site: settlements and dragons on a random map."""
+import os
+import time
+
+from entities import Camp, City, Dragon, Village
+from world.recorder import Recorder, recording_dir, recording_path
+from world.snapshot import load_world
+from world.stats import get_stats
+from world.world import World
+
+
+def populate_demo(world: World) -> None:
+    """Add the example settlements and dragons."""
+    worker_camp = Camp("Mining Camp", (20, 20))
+    village = Village("Riverside", (30, 30))
+    city = City("Capital", (50, 50))
+
+    # Add a depleted village to show the depleted state
+    depleted_village = Village("Abandoned Hamlet", (70, 70))
+    depleted_village.life = 0
+    depleted_village.die(world, "hunger")
+
+    world.add_entity(worker_camp)
+    world.add_entity(village)
+    world.add_entity(city)
+    world.add_entity(depleted_village)
+
+    dragons = [
+        (Dragon("Jielle", ["serpent", "aquatic"], (180, 180)), worker_camp),
+        (Dragon("Thrax", ["brute", "mountain"], (20, 200)), worker_camp),
+        (Dragon("Sylph", ["blade", "verdant"], (10, 30)), village),
+        (Dragon("Ember", ["druid", "flame"], (10, 50)), village),
+        (Dragon("Aurelia", ["midas", "mountain"], (25, 25)), city),
+    ]
+    for dragon, target in dragons:
+        dragon.target = target
+        dragon.state = "moving"
+        world.add_entity(dragon)
+
+
+def build_demo_world(seed=None, height_map=None) -> World:
+    world = World(seed, height_map)
+    populate_demo(world)
+    return world
+
+
+def create_world(collect_stats: bool = True) -> World:
+    """Load the prebaked world named by WORLD_SNAPSHOT, or generate one.
+
+    WORLD_SEED fixes the seed of a generated world. WORLD_IDLE_TIMEOUT is the
+    number of seconds without readers before ticking stops (0 never stops),
+    and WORLD_CATCH_UP_BUDGET the seconds a returning reader may wait.
+    With WORLD_RECORDING_DIR set, every tick is recorded there for playback.
+    `collect_stats` is off in the shared-mode simulator, where nothing could
+    query the statistics.
+    """
+    snapshot = os.environ.get("WORLD_SNAPSHOT")
+    if snapshot and os.path.exists(snapshot):
+        world = load_world(snapshot)
+    else:
+        seed = os.environ.get("WORLD_SEED")
+        world = build_demo_world(int(seed) if seed else None)
+
+    idle_timeout = float(os.environ.get("WORLD_IDLE_TIMEOUT", world.IDLE_TIMEOUT))
+    world.idle_timeout = idle_timeout or None
+    world.catch_up_budget = float(os.environ.get("WORLD_CATCH_UP_BUDGET", world.CATCH_UP_BUDGET))
+
+    if collect_stats:
+        get_stats(world)  # Collect from the first tick, not the first query
+    directory = recording_dir()
+    if directory:
+        name = f"{world.seed}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        world.recorder = Recorder(world, recording_path(directory, name)).attach(world)
+    return world
@@ -5,8 +5,8 @@ class HeightMapGenerator:
 
     def __init__(self, seed=0):
         self.permutation = list(range(256))
-        random.seed(seed)
-        random.shuffle(self.permutation)
+        # Own generator, so building terrain leaves the global random state alone
+        random.Random(seed).shuffle(self.permutation)
         self.p = self.permutation + self.permutation
 
     def fade(self, t):
@@ -0,0 +1,136 @@
+"""Host many independent worlds in one process.
+
+Worlds are named by id: a numeric id is also the seed, and any other id is
+hashed to one. The manager builds worlds on first use and keeps the
+recently read ones simulating. When the estimated memory of all loaded
+worlds exceeds the budget, or more than `max_loaded` are loaded, the least
+recently read ones are saved as snapshots and unloaded. They are restored
+from disk on their next request and fast-forward the time they spent there.
+Worlds with the same seed share one heightmap. At most `max_worlds` worlds
+exist, loaded or on disk, so requests for new ids cannot grow CPU, threads
+or the snapshot directory without bound.
+"""
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+from world.demo import build_demo_world
+from world.snapshot import load_world, save_world
+from world.world import World
+
+WORLD_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Rough sizes for the memory estimate, measured on the demo world
+ENTITY_BYTES = 2048  # Entity, cached serialization and index entries
+CHANGE_BYTES = 512  # One changed entity kept in the delta history
+TILE_BYTES = 33  # One heightmap sample, counted once per seed
+
+MAX_LOADED = 16  # Simulating at once, each with its own update thread
+MAX_WORLDS = 256  # Loaded or snapshotted; new ids beyond this are refused
+
+
+def seed_for(world_id: str) -> int:
+    """The seed a world id stands for."""
+    if world_id.isdigit():
+        return int(world_id)
+    return zlib.crc32(world_id.encode()) % 1000000
+
+
+def estimate_bytes(world: World) -> int:
+    """Approximate memory held by one world, excluding its shared terrain."""
+    changes = sum(len(entry.changed) + len(entry.added) for entry in world.changes.history)
+    return len(world.entities) * ENTITY_BYTES + changes * CHANGE_BYTES
+
+
+class WorldManager:
+
+    def __init__(self, snapshot_dir: str, memory_budget: int,
+                 max_loaded: int = MAX_LOADED, max_worlds: int = MAX_WORLDS):
+        self.snapshot_dir = snapshot_dir
+        self.memory_budget = memory_budget
+        self.max_loaded = max_loaded
+        self.max_worlds = max_worlds
+        self.worlds: Dict[str, World] = {}
+        self._terrain: Dict[int, List[List[float]]] = {}  # seed -> heightmap shared by loaded worlds
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.worlds)
+
+    def snapshot_path(self, world_id: str) -> str:
+        return os.path.join(self.snapshot_dir, f"{world_id}.pickle")
+
+    def get(self, world_id: str) -> Optional[World]:
+        """The running world with this id, loading or building it if needed.
+
+        Returns None for ids that are not valid world names, and for new ids
+        once `max_worlds` worlds exist.
+        """
+        if not WORLD_ID.match(world_id):
+            return None
+        with self._lock:
+            world = self.worlds.get(world_id)
+            if world is None:
+                if not os.path.exists(self.snapshot_path(world_id)) and self._count() >= self.max_worlds:
+                    return None
+                world = self._load(world_id)
+                self.worlds[world_id] = world
+                world.start_update_thread()
+            world.touch()
+            self._evict(keep=world_id)
+            return world
+
+    def estimate_bytes(self) -> int:
+        """Estimated memory of every loaded world, with each seed's terrain counted once."""
+        terrain = len(self._terrain) * World.WIDTH * World.HEIGHT * TILE_BYTES
+        return terrain + sum(estimate_bytes(world) for world in self.worlds.values())
+
+    def _count(self) -> int:
+        """Worlds that exist, loaded or as snapshots."""
+        try:
+            stored = {name[:-len(".pickle")] for name in os.listdir(self.snapshot_dir) if name.endswith(".pickle")}
+        except OSError:
+            stored = set()
+        return len(stored | set(self.worlds))
+
+    def unload(self, world_id: str) -> None:
+        """Stop a world and keep it on disk until it is next requested."""
+        with self._lock:
+            self._unload(world_id)
+
+    def _load(self, world_id: str) -> World:
+        path = self.snapshot_path(world_id)
+        if os.path.exists(path):
+            world = load_world(path, keep_clock=True)
+            # Swap the snapshot's copy of the terrain for the shared one
+            world.height_map = self._terrain.setdefault(world.seed, world.height_map)
+            return world
+
+        seed = seed_for(world_id)
+        world = build_demo_world(seed, self._terrain.get(seed))
+        self._terrain.setdefault(seed, world.height_map)
+        return world
+
+    def _unload(self, world_id: str) -> None:
+        world = self.worlds.pop(world_id, None)
+        if world is None:
+            return
+        world.stop_update_thread()
+        broadcaster = getattr(world, "broadcaster", None)
+        if broadcaster is not None:
+            broadcaster.close()
+        with world._tick_lock:  # Wait out a tick in progress
+            save_world(world, self.snapshot_path(world_id))
+        if all(other.seed != world.seed for other in self.worlds.values()):
+            self._terrain.pop(world.seed, None)
+
+    def _evict(self, keep: str) -> None:
+        """Unload the least recently read worlds until they fit the budget and `max_loaded`."""
+        by_last_read = sorted(self.worlds, key=lambda world_id: self.worlds[world_id].last_read_time)
+        for world_id in by_last_read:
+            if len(self.worlds) <= self.max_loaded and self.estimate_bytes() <= self.memory_budget:
+                break
+            if world_id != keep:
+                self._unload(world_id)
@@ -0,0 +1,273 @@
+"""Record a world's ticks to an append-only file and play them back.
+
+A recording starts with MAGIC and a JSON header (seed, world id, tick
+interval, map width), followed by chunks. Each chunk is a CHUNK header
+(first tick, last tick, frame count, flags, payload length) and a
+zlib-compressed pickled list of frames. A frame is either a keyframe with the
+full entity state or a delta with the entities changed and the ids removed
+since the previous frame. Every KEYFRAME_INTERVAL ticks a keyframe starts a
+new chunk, so seeking reads at most one keyframe interval of frames. Chunks
+are only ever appended, and a chunk cut short by a crash is ignored. Like
+snapshots, recordings are pickles: only play back files you produced.
+
+The tick listener keeps references to the change log's serialized dicts,
+which are never modified once committed. A writer thread encodes and
+writes them, so a tick costs a list append. The first tick after a
+keyframe also pays for copying the state's values. The writer takes every
+chunk waiting for it at once and writes them together. At most
+MAX_PENDING_CHUNKS wait; when the writer falls that far behind, the
+buffered frames are dropped and counted, and recording resumes with a
+keyframe so the file stays consistent.
+"""
+import json
+import os
+import pickle
+import queue
+import re
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+MAGIC = b"HBREC\x00\x01\n"
+LENGTH = struct.Struct("<I")
+CHUNK = struct.Struct("<IIIBI")  # first tick, last tick, frames, flags, payload bytes
+KEYFRAME_FLAG = 1
+
+KEYFRAME_INTERVAL = 120  # Ticks between keyframes
+CHUNK_TICKS = 16  # Frames buffered before a chunk is written
+MAX_PENDING_CHUNKS = 64  # Chunks queued for the writer before frames are dropped
+COMPRESSION = 1  # zlib level; higher levels cost more than the encoding itself
+RECORDING_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def recording_dir() -> Optional[str]:
+    """Where recordings are kept, from WORLD_RECORDING_DIR; None disables recording."""
+    return os.environ.get("WORLD_RECORDING_DIR") or None
+
+
+def recording_path(directory: str, name: str) -> Optional[str]:
+    """The file of the recording `name`, or None if that is not a valid name."""
+    if not RECORDING_NAME.match(name):
+        return None
+    return os.path.join(directory, f"{name}.rec")
+
+
+class Recorder:
+    """Tick listener appending every committed tick of one world to `path`."""
+
+    def __init__(self, world, path: str, world_id: Optional[str] = None,
+                 keyframe_interval: int = KEYFRAME_INTERVAL, chunk_ticks: int = CHUNK_TICKS):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.chunk_ticks = chunk_ticks
+        self._frames: List[Tuple] = []
+        self._last_keyframe: Optional[int] = None
+        self._last_tick: Optional[int] = None
+        self._queue: queue.Queue = queue.Queue(MAX_PENDING_CHUNKS)
+        self.dropped_frames = 0
+        self.writer_seconds = 0.0  # CPU time spent encoding and writing
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "xb")  # One run of one world per file, so ticks only increase
+        header = json.dumps({
+            "seed": world.seed,
+            "world_id": world_id,
+            "update_interval": world.update_interval,
+            "width": world.WIDTH,
+            "height": world.HEIGHT,
+            "keyframe_interval": keyframe_interval,
+            "started": time.time(),
+        }).encode()
+        self._file.write(MAGIC + LENGTH.pack(len(header)) + header)
+        self._file.flush()
+        self._writer = threading.Thread(target=self._write_chunks, daemon=True)
+        self._writer.start()
+
+    def attach(self, world) -> "Recorder":
+        world.get_changes()
+        self.record(world)
+        world.tick_listeners.append(self.record)
+        return self
+
+    def record(self, world) -> None:
+        """Tick listener: queue the change just committed, or a keyframe."""
+        changes = world.changes
+        tick = changes.tick
+        if tick is None or tick == self._last_tick:
+            return
+        entry = changes.history[-1] if changes.history else None
+        if (self._last_keyframe is None or tick - self._last_keyframe >= self.keyframe_interval
+                or entry is None or entry.tick != tick or entry.base != self._last_tick):
+            self.flush()
+            self._frames.append((tick, None, time.time(), list(changes.state.values()), ()))
+            self._last_keyframe = tick
+        else:
+            self._frames.append((tick, entry.base, time.time(), entry.changed, entry.removed))
+            if len(self._frames) >= self.chunk_ticks:
+                self.flush()
+        self._last_tick = tick
+
+    def flush(self) -> None:
+        """Hand the buffered frames to the writer as one chunk, or drop them if it is behind."""
+        if self._frames:
+            try:
+                self._queue.put_nowait(self._frames)
+            except queue.Full:
+                # The deltas that follow would refer to the dropped ones
+                self.dropped_frames += len(self._frames)
+                self._last_keyframe = None
+            self._frames = []
+
+    def close(self) -> None:
+        if self._frames:  # The last frames wait for room rather than being dropped
+            self._queue.put(self._frames)
+            self._frames = []
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+        if self.dropped_frames:
+            print(f"Recording {self.path} dropped {self.dropped_frames} frames while the writer was behind")
+
+    @staticmethod
+    def encode_chunk(frames: List[Tuple]) -> bytes:
+        encoded = []
+        for tick, base, wall, entities, removed in frames:
+            if base is None:
+                encoded.append({"t": tick, "w": wall, "e": entities})
+            else:
+                encoded.append({"t": tick, "b": base, "w": wall, "c": list(entities.values()), "r": sorted(removed)})
+        payload = zlib.compress(pickle.dumps(encoded, protocol=pickle.HIGHEST_PROTOCOL), COMPRESSION)
+        flags = KEYFRAME_FLAG if frames[0][1] is None else 0
+        return CHUNK.pack(frames[0][0], frames[-1][0], len(frames), flags, len(payload)) + payload
+
+    def _write_chunks(self) -> None:
+        done = False
+        while not done:
+            batch = [self._queue.get()]
+            while True:  # Take everything else already waiting
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            start = time.thread_time()
+            if None in batch:
+                done = True
+                batch = batch[:batch.index(None)]
+            data = b"".join(self.encode_chunk(frames) for frames in batch)
+            try:
+                self._file.write(data)
+                self._file.flush()
+            except (OSError, ValueError) as e:
+                print(f"Could not write recording {self.path}: {e}")
+            self.writer_seconds += time.thread_time() - start
+
+
+class ChunkInfo(NamedTuple):
+    first_tick: int
+    last_tick: int
+    frames: int
+    keyframe: bool
+    offset: int  # Of the payload
+    length: int
+
+
+class Recording:
+    """Read side of a recording: the chunk index and frames from any tick."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.chunks: List[ChunkInfo] = []
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a world recording")
+            (length,) = LENGTH.unpack(file.read(LENGTH.size))
+            self.header: Dict[str, Any] = json.loads(file.read(length))
+            self._scan(file)
+        self._keyframe_chunks = [i for i, chunk in enumerate(self.chunks) if chunk.keyframe]
+
+    def _scan(self, file) -> None:
+        """Index chunk headers, stopping at a chunk cut short by a crash."""
+        size = os.fstat(file.fileno()).st_size
+        offset = file.tell()
+        while offset + CHUNK.size <= size:
+            file.seek(offset)
+            first, last, frames, flags, length = CHUNK.unpack(file.read(CHUNK.size))
+            if offset + CHUNK.size + length > size:
+                break
+            self.chunks.append(ChunkInfo(first, last, frames, bool(flags & KEYFRAME_FLAG), offset + CHUNK.size, length))
+            offset += CHUNK.size + length
+
+    @property
+    def first_tick(self) -> Optional[int]:
+        return self.chunks[0].first_tick if self.chunks else None
+
+    @property
+    def last_tick(self) -> Optional[int]:
+        return self.chunks[-1].last_tick if self.chunks else None
+
+    def describe(self) -> Dict[str, Any]:
+        return dict(self.header, first_tick=self.first_tick, last_tick=self.last_tick, chunks=len(self.chunks))
+
+    def _read_chunk(self, file, chunk: ChunkInfo) -> List[Dict[str, Any]]:
+        file.seek(chunk.offset)
+        return pickle.loads(zlib.decompress(file.read(chunk.length)))
+
+    def frames(self, start: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Payloads in the /api/world format: a keyframe at `start`, then every later delta.
+
+        The keyframe is for the last recorded tick at or before `start`, and
+        is built by applying the deltas since the nearest keyframe before it.
+        """
+        if not self._keyframe_chunks:
+            return
+        if start is None:
+            start = self.first_tick
+        firsts = [self.chunks[i].first_tick for i in self._keyframe_chunks]
+        begin = self._keyframe_chunks[max(0, bisect_right(firsts, start) - 1)]
+
+        state: Dict[int, Dict[str, Any]] = {}
+        tick = None
+        started = False
+        with open(self.path, "rb") as file:
+            for chunk in self.chunks[begin:]:
+                for frame in self._read_chunk(file, chunk):
+                    if tick is not None and frame["t"] > start:
+                        if not started:
+                            started = True
+                            yield {"keyframe": True, "update_count": tick, "entities": list(state.values())}
+                        yield self._payload(state, frame, tick)
+                    else:
+                        self._apply(state, frame)
+                    tick = frame["t"]
+        if not started and tick is not None:
+            yield {"keyframe": True, "update_count": tick, "entities": list(state.values())}
+
+    @staticmethod
+    def _apply(state: Dict[int, Dict[str, Any]], frame: Dict[str, Any]) -> None:
+        if "e" in frame:
+            state.clear()
+            state.update((data["id"], data) for data in frame["e"])
+            return
+        for entity_id in frame["r"]:
+            state.pop(entity_id, None)
+        state.update((data["id"], data) for data in frame["c"])
+
+    def _payload(self, state: Dict[int, Dict[str, Any]], frame: Dict[str, Any], previous: int) -> Dict[str, Any]:
+        """Apply a frame and describe it as the client expects."""
+        if "e" in frame:
+            self._apply(state, frame)
+            return {"keyframe": True, "update_count": frame["t"], "entities": frame["e"]}
+        added = [data for data in frame["c"] if data["id"] not in state]
+        changed = [data for data in frame["c"] if data["id"] in state]
+        self._apply(state, frame)
+        return {
+            "keyframe": False,
+            "since": previous,
+            "update_count": frame["t"],
+            "added": added,
+            "changed": changed,
+            "removed": frame["r"],
+        }
@@ -0,0 +1,168 @@
+"""Routes between settlements, planned once and shared by every caravan.
+
+Each live settlement gets an entry tile: the nearest open field tile next to
+it. The network keeps one planned route for each pair of entry tiles, as a
+tuple that caravans read by index and never modify. A route is planned the
+first time a caravan asks for it, with a bounded search, and pairs with no
+route are remembered until a tile is unblocked. Adding, removing, promoting
+or depleting a settlement only marks the network stale; the next read
+refreshes the entry tiles and drops the routes that became invalid, so a
+batch of changes costs one refresh and no planning.
+"""
+import heapq
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple
+
+from entities.base.entity import Coordinates
+from entities.base.settlement import Settlement
+
+if TYPE_CHECKING:
+    from world import World
+
+Route = Tuple[Coordinates, ...]  # From one entry tile to another, both included
+
+SQRT2 = 2 ** 0.5
+ENTRY_SEARCH_RADIUS = 8
+MAX_SEARCH = 16000  # Tiles expanded before a pair counts as unreachable; long routes take about 6000
+
+
+def find_route(world: "World", start: Coordinates, goal: Coordinates, blocked: Set[Coordinates],
+               max_search: int = MAX_SEARCH) -> Optional[Route]:
+    """A* over open field tiles with the same costs as Mobile.find_path."""
+    def heuristic(pos: Coordinates) -> float:
+        # Octile distance: exact on an open field with diagonal steps costing SQRT2
+        dx, dy = abs(pos[0] - goal[0]), abs(pos[1] - goal[1])
+        return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+    came_from: Dict[Coordinates, Coordinates] = {}
+    g_score = {start: 0.0}
+    heap = [(heuristic(start), 0, start)]
+    counter = 1
+    visited = set()
+
+    while heap and len(visited) < max_search:
+        _, _, current = heapq.heappop(heap)
+        if current in visited:
+            continue
+        if current == goal:
+            route = [current]
+            while current in came_from:
+                current = came_from[current]
+                route.append(current)
+            return tuple(reversed(route))
+        visited.add(current)
+
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                neighbor = (current[0] + dx, current[1] + dy)
+                if neighbor in visited or not is_open(world, neighbor, blocked):
+                    continue
+                tentative_g = g_score[current] + (SQRT2 if dx and dy else 1.0)
+                if tentative_g < g_score.get(neighbor, float("inf")):
+                    g_score[neighbor] = tentative_g
+                    came_from[neighbor] = current
+                    heapq.heappush(heap, (tentative_g + heuristic(neighbor), counter, neighbor))
+                    counter += 1
+    return None
+
+
+def is_open(world: "World", coordinates: Coordinates, blocked: Set[Coordinates]) -> bool:
+    """Caravan passability: an in-bounds field tile no settlement stands on."""
+    x, y = coordinates
+    if x < 0 or y < 0 or x >= world.WIDTH or y >= world.HEIGHT:
+        return False
+    return coordinates not in blocked and world.get_biome_from_height(world.height_map[y][x]) == 'field'
+
+
+class RouteNetwork:
+
+    def __init__(self):
+        self.entries: Dict[int, Coordinates] = {}  # Live settlement id -> entry tile
+        self.routes: Dict[Tuple[int, int], Route] = {}  # (from id, to id) -> route
+        self.unreachable: Set[Tuple[Coordinates, Coordinates]] = set()  # Entry tile pairs with no route
+        self.blocked: Set[Coordinates] = set()  # Tiles of every settlement, depleted or not
+        self._entry_owner: Dict[Coordinates, int] = {}
+        self._stale = False
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Snapshots from before routes were planned on demand
+        self.__dict__.setdefault("unreachable", set())
+        self.__dict__.setdefault("_stale", False)
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+    def invalidate(self) -> None:
+        """Settlements changed; refresh on the next read."""
+        self._stale = True
+
+    def entry(self, world: "World", settlement: Settlement) -> Optional[Coordinates]:
+        """Where caravans leaving or reaching this settlement stand."""
+        self.refresh(world)
+        return self.entries.get(settlement.id)
+
+    def route_from(self, world: "World", coordinates: Coordinates, destination: Settlement) -> Optional[Route]:
+        """The shared route from the entry tile at `coordinates` to `destination`, planned on first use."""
+        self.refresh(world)
+        origin = self._entry_owner.get(coordinates)
+        if origin is None or destination.id not in self.entries:
+            return None
+        route = self.routes.get((origin, destination.id))
+        if route is None:
+            ends = (coordinates, self.entries[destination.id])
+            if ends in self.unreachable:
+                return None
+            route = find_route(world, ends[0], ends[1], self.blocked)
+            if route is None:
+                self.unreachable.update((ends, ends[::-1]))
+                return None
+            self.routes[origin, destination.id] = route
+            self.routes[destination.id, origin] = route[::-1]
+        return route
+
+    def refresh(self, world: "World") -> None:
+        """Bring the network in line with the world's settlements, if they changed since the last read."""
+        if not self._stale:
+            return
+        self._stale = False
+        settlements = [entity for entity in world.entities if isinstance(entity, Settlement)]
+        blocked = {tile for settlement in settlements for tile, _, _ in settlement.get_tiles()}
+        if self.blocked - blocked:
+            self.unreachable.clear()  # A freed tile may open a way through
+        newly_blocked = blocked - self.blocked
+        self.blocked = blocked
+
+        entries = {}
+        for settlement in settlements:
+            if settlement.is_alive:
+                entry = self._find_entry(world, settlement)
+                if entry is not None:
+                    entries[settlement.id] = entry
+        self.entries = entries
+        self._entry_owner = {entry: settlement_id for settlement_id, entry in entries.items()}
+
+        # Keep routes whose ends are unchanged and that no new tile blocks
+        self.routes = {
+            (origin, destination): route
+            for (origin, destination), route in self.routes.items()
+            if entries.get(origin) == route[0] and entries.get(destination) == route[-1]
+            and not newly_blocked.intersection(route)
+        }
+
+    def _find_entry(self, world: "World", settlement: Settlement) -> Optional[Coordinates]:
+        """Nearest open tile to the settlement's centre, searching outwards ring by ring."""
+        x, y = settlement.coordinates
+        for radius in range(1, ENTRY_SEARCH_RADIUS + 1):
+            ring = [
+                (x + dx, y + dy)
+                for dy in range(-radius, radius + 1)
+                for dx in range(-radius, radius + 1)
+                if max(abs(dx), abs(dy)) == radius
+            ]
+            ring.sort(key=lambda tile: (tile[0] - x) ** 2 + (tile[1] - y) ** 2)
+            for tile in ring:
+                if is_open(world, tile, self.blocked):
+                    return tile
+        return None
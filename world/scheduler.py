@@ -0,0 +1,140 @@
+"""Timing wheel that only runs the entities with work due this tick.
+
+After each update an entity reports how many ticks it can sleep
+(Entity.next_wake); the ticks in between are ones where update() would only
+count down a timer, or, while the world fast-forwards, change state that
+skip() can compute in one go. When it runs again, Entity.skip() applies those missed
+ticks in closed form first, so waking early (hurt, healed, target died) is
+always safe. Due entities run in id order, which is the order of
+World.entities, so a tick matches updating every entity in turn.
+"""
+import heapq
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set
+
+if TYPE_CHECKING:
+    from entities.base.entity import Entity
+
+WHEEL_SIZE = 64  # Slots; longer sleeps stay in their slot for extra rounds
+
+
+class Scheduler:
+
+    def __init__(self, entities_by_id: Dict[int, "Entity"], tick: int = 0):
+        self.entities_by_id = entities_by_id
+        self.tick = tick  # Last tick processed
+        self.slots: List[Dict[int, int]] = [{} for _ in range(WHEEL_SIZE)]  # id -> due tick
+        self.due_at: Dict[int, int] = {}
+        self.last_run: Dict[int, int] = {}
+        self.watchers: Dict[int, Set[int]] = {}  # watched id -> ids woken by its death
+        self._running: Optional[List[int]] = None  # Heap of ids still to run this tick
+        self._current = 0
+
+    def __len__(self) -> int:
+        return len(self.due_at)
+
+    def add(self, entity) -> None:
+        """Register a new entity; it runs on the next tick."""
+        self.last_run[entity.id] = self.tick
+        entity._scheduler = self
+        self._schedule(entity.id, self.tick + 1)
+
+    def remove(self, entity) -> None:
+        self._unschedule(entity.id)
+        self.last_run.pop(entity.id, None)
+        self.watchers.pop(entity.id, None)
+        entity._scheduler = None
+
+    def wake(self, entity) -> None:
+        """Run the entity at its next chance: later this tick if it hasn't run yet."""
+        if entity.id not in self.last_run:
+            return
+        if self._running is not None and entity.id > self._current and self.last_run[entity.id] < self.tick:
+            self._unschedule(entity.id)
+            if entity.id not in self._running:
+                heapq.heappush(self._running, entity.id)
+            return
+        if self.due_at.get(entity.id, self.tick + 2) > self.tick + 1:
+            self._schedule(entity.id, self.tick + 1)
+
+    def sync(self, entity) -> None:
+        """Apply a sleeping entity's skipped ticks now, before others read or change it."""
+        last = self.last_run.get(entity.id)
+        if last is None:
+            return
+        # Entities before the one running this tick would already have run it
+        upto = self.tick if self._running is None or entity.id < self._current else self.tick - 1
+        if upto > last:
+            entity.skip(upto - last)
+            self.last_run[entity.id] = upto
+
+    def catch_up(self) -> None:
+        """Bring every entity to the current tick and run them all next tick.
+
+        Used after World.fast_forward(), whose sleeps assumed nothing would be
+        published in between.
+        """
+        for entity_id, last in self.last_run.items():
+            entity = self.entities_by_id.get(entity_id)
+            if entity is None:
+                continue
+            if last < self.tick:
+                entity.skip(self.tick - last)
+                self.last_run[entity_id] = self.tick
+            self._schedule(entity_id, self.tick + 1)
+
+    def notify_death(self, entity) -> None:
+        """Wake everything that asked to be told when this entity dies."""
+        for watcher_id in self.watchers.pop(entity.id, ()):
+            watcher = self.entities_by_id.get(watcher_id)
+            if watcher is not None:
+                self.wake(watcher)
+
+    def run(self, tick: int) -> Iterator["Entity"]:
+        """Yield the entities due at this tick in World.entities order.
+
+        The caller updates each one and then hands it back to reschedule().
+        """
+        self.tick = tick
+        slot = self.slots[tick % WHEEL_SIZE]
+        due = [entity_id for entity_id, due_tick in slot.items() if due_tick <= tick]
+        for entity_id in due:
+            del slot[entity_id]
+            del self.due_at[entity_id]
+        heapq.heapify(due)
+
+        self._running = due
+        try:
+            while due:
+                self._current = entity_id = heapq.heappop(due)
+                entity = self.entities_by_id.get(entity_id)
+                if entity is None:
+                    continue
+                skipped = tick - self.last_run[entity_id] - 1
+                if skipped > 0:
+                    entity.skip(skipped)
+                self.last_run[entity_id] = tick
+                yield entity
+        finally:
+            self._running = None
+            self._current = 0
+
+    def reschedule(self, entity, world) -> None:
+        """Put an entity that just ran back on the wheel, if it has future work."""
+        if entity.id not in self.last_run:
+            return  # Removed during its update
+        for watched in entity.watches():
+            if watched.id is not None:
+                self.watchers.setdefault(watched.id, set()).add(entity.id)
+        delay = entity.next_wake(world)
+        if delay is not None and entity.id not in self.due_at:
+            self._schedule(entity.id, self.tick + max(1, delay))
+
+    def _schedule(self, entity_id: int, tick: int) -> None:
+        self._unschedule(entity_id)
+        self.slots[tick % WHEEL_SIZE][entity_id] = tick
+        self.due_at[entity_id] = tick
+
+    def _unschedule(self, entity_id: int) -> None:
+        tick = self.due_at.pop(entity_id, None)
+        if tick is not None:
+            del self.slots[tick % WHEEL_SIZE][entity_id]
@@ -0,0 +1,187 @@
+"""One simulation process publishing to many web workers through shared memory.
+
+The simulator (`python -m world.simulator`) owns the only World. After every
+tick it writes the serialized entity state into a shared memory segment
+guarded by a sequence lock; the heightmap lives in a second segment that is
+written once. Web workers attach a SharedWorldView, which looks enough like a
+World for the endpoints: it maps the terrain without copying, and rebuilds
+its change log from the latest published tick without running any
+simulation code.
+"""
+import json
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, List, Optional
+
+from world.changelog import ChangeLog
+from world.world import World
+
+DEFAULT_NAME = "here-be-world"
+DEFAULT_CAPACITY = 32 << 20  # Bytes reserved for the serialized state
+
+# seq, tick, length, committed_at, last_update_time, update_interval
+STATE_HEADER = struct.Struct("<QQQddd")
+SEQ = struct.Struct("<Q")
+STATE_FIELDS = struct.Struct("<QQddd")  # The header after seq
+# magic, seed, width, height
+TERRAIN_HEADER = struct.Struct("<8sQII")
+TERRAIN_MAGIC = b"HEREBE01"
+
+
+class SharedWorldPublisher:
+    """Simulation side: owns both segments and rewrites the state after each tick."""
+
+    def __init__(self, world: World, name: str = DEFAULT_NAME, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.terrain = shared_memory.SharedMemory(
+            f"{name}-terrain", create=True,
+            size=TERRAIN_HEADER.size + world.WIDTH * world.HEIGHT * 8,
+        )
+        self.state = shared_memory.SharedMemory(
+            f"{name}-state", create=True, size=STATE_HEADER.size + capacity,
+        )
+        self.seq = 0
+
+        TERRAIN_HEADER.pack_into(self.terrain.buf, 0, TERRAIN_MAGIC, world.seed, world.WIDTH, world.HEIGHT)
+        row_format = struct.Struct(f"{world.WIDTH}d")
+        for y, row in enumerate(world.height_map):
+            row_format.pack_into(self.terrain.buf, TERRAIN_HEADER.size + y * row_format.size, *row)
+
+    def publish(self, world: World) -> None:
+        """Tick listener: write the latest committed state under the sequence lock."""
+        changes = world.get_changes()
+        body = json.dumps(list(changes.state.values()), separators=(",", ":")).encode()
+        if len(body) > self.capacity:
+            print(f"World state of {len(body)} bytes exceeds shared capacity {self.capacity}")
+            return
+
+        buf = self.state.buf
+        # Odd sequence numbers tell readers a write is in progress
+        self.seq += 1
+        SEQ.pack_into(buf, 0, self.seq)
+        buf[STATE_HEADER.size:STATE_HEADER.size + len(body)] = body
+        STATE_FIELDS.pack_into(
+            buf, SEQ.size, changes.tick, len(body),
+            changes.timestamp, world.last_update_time, world.update_interval,
+        )
+        # The even sequence number goes last, once everything it vouches for is written
+        self.seq += 1
+        SEQ.pack_into(buf, 0, self.seq)
+
+    def close(self) -> None:
+        for segment in (self.terrain, self.state):
+            segment.close()
+            segment.unlink()
+
+
+def _attach(name: str, timeout: float) -> shared_memory.SharedMemory:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            segment = shared_memory.SharedMemory(name)
+            break
+        except FileNotFoundError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+    # Attaching registers the segment for cleanup at exit; only the simulator may unlink it
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+class SharedWorldView:
+    """Worker side: a read-only World stand-in fed from the simulator's segments."""
+
+    WIDTH = World.WIDTH
+    HEIGHT = World.HEIGHT
+    CHANGE_HISTORY = World.CHANGE_HISTORY
+    get_biome_from_height = staticmethod(World.get_biome_from_height)
+
+    def __init__(self, name: str = DEFAULT_NAME, timeout: float = 30.0):
+        self._terrain = _attach(f"{name}-terrain", timeout)
+        self._state = _attach(f"{name}-state", timeout)
+
+        magic, self.seed, width, height = TERRAIN_HEADER.unpack_from(self._terrain.buf, 0)
+        if magic != TERRAIN_MAGIC:
+            raise ValueError(f"Shared memory {name}-terrain does not hold a world")
+        self.WIDTH, self.HEIGHT = width, height
+
+        # Rows are views straight into shared memory, no copy per worker
+        heights = self._terrain.buf[TERRAIN_HEADER.size:].cast("d")
+        self.height_map = [heights[y * width:(y + 1) * width] for y in range(height)]
+
+        self.changes = ChangeLog(self.CHANGE_HISTORY)
+        self.entities_by_id: Dict = {}  # Live entities exist only in the simulator
+        self.entities_by_name: Dict = {}
+        self.tick_listeners: List[Callable[["SharedWorldView"], None]] = []
+        self.update_interval = 1.0
+        self.last_update_time = time.time()
+        self.update_count = 0
+        self._lock = threading.Lock()
+
+    def _read(self, retries: int = 100) -> Optional[tuple]:
+        """Consistent (header, body) pair, or None if the writer kept racing us."""
+        buf = self._state.buf
+        for _ in range(retries):
+            header = STATE_HEADER.unpack_from(buf, 0)
+            seq, tick, length = header[:3]
+            if seq == 0 or seq % 2:
+                time.sleep(0.001)
+                continue
+            if tick == self.changes.tick:
+                return header, None
+            body = bytes(buf[STATE_HEADER.size:STATE_HEADER.size + length])
+            if SEQ.unpack_from(buf, 0)[0] == seq:
+                return header, body
+        return None
+
+    def update(self) -> None:
+        """Pick up the latest published tick, if it is newer than ours."""
+        with self._lock:
+            read = self._read()
+            if read is None:
+                return
+            (_, tick, _, _, self.last_update_time, self.update_interval), body = read
+            if body is None:
+                return
+            state = {data["id"]: data for data in json.loads(body)}
+            self.update_count = tick
+            self.changes.commit_state(tick, state)
+        for listener in self.tick_listeners:
+            # A failing listener must not stop requests from reading the world
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"Error in shared world tick listener: {e}")
+
+    def touch(self) -> None:
+        """Readers never suspend the simulator, which always ticks."""
+
+    def get_changes(self) -> ChangeLog:
+        if self.changes.tick is None:
+            self.update()
+        return self.changes
+
+    def get_next_update_time(self) -> float:
+        return max(0, self.update_interval - (time.time() - self.last_update_time))
+
+    def update_loop(self) -> None:
+        while True:
+            try:
+                self.update()
+            except Exception as e:
+                print(f"Error reading shared world: {e}")
+            time.sleep(0.1)
+
+    def start_update_thread(self) -> None:
+        threading.Thread(target=self.update_loop, daemon=True).start()
+
+    def close(self) -> None:
+        """Detach from the segments; the simulator owns and unlinks them."""
+        for row in self.height_map:
+            row.release()
+        self.height_map = []
+        self._terrain.close()
+        self._state.close()
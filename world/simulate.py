@@ -0,0 +1,199 @@
+"""Run a world headless and report where the time goes.
+
+    python -m world.simulate --seed 1 --ticks 1000 --dragons 50 --caravans 20 --cattle 30
+    python -m world.simulate --seed 1 --ticks 1000 --profile sim.prof --tracemalloc 15
+
+Setup is timed in phases (terrain, spirits, populate) and every tick is
+split into the entity updates and the change log commit. --profile runs the
+ticks under cProfile, dumps the stats to a file for snakeviz or pstats and
+prints the top functions. --tracemalloc prints the lines that allocated the
+most memory over the run. --record writes the ticks to a recording (see
+world.recorder), timing the tick listener as its own phase and reporting
+the CPU its writer thread used per tick.
+
+All randomness comes from the world's own streams (World.rng), so a run is
+determined by its arguments. The final state digest can be compared across
+runs, and --check-replay reruns the ticks from a pickled copy of the
+initial state and exits non-zero unless the two final states are identical.
+"""
+import argparse
+import cProfile
+import hashlib
+import json
+import pickle
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from entities import Camp, Caravan, Cattle, City, Dragon, Settlement, Spirit, Village
+from world.demo import populate_demo
+from world.heightmap import HeightMapGenerator
+from world.recorder import Recorder
+from world.terrain_stats import SITE_PROFILES
+from world.world import World
+
+DRAGON_KINDS = [["serpent", "aquatic"], ["brute", "mountain"], ["blade", "verdant"], ["druid", "flame"], ["midas", "mountain"]]
+CATTLE_COLOR = "#8b5a2b"
+PLACEMENT_ATTEMPTS = 200
+
+
+class PhaseTimer:
+    """Wall time per named phase, summed over every time the phase runs."""
+
+    def __init__(self):
+        self.totals: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] += time.perf_counter() - start
+
+    def report(self, ticks: int) -> None:
+        print(f"{'phase':<10} {'total ms':>10} {'ms/tick':>9}")
+        for name, total in self.totals.items():
+            per_tick = f"{total / ticks * 1000:9.3f}" if name in ("entities", "commit", "record") and ticks else ""
+            print(f"{name:<10} {total * 1000:10.1f} {per_tick:>9}")
+
+
+def open_tile_near(world: World, center, radius: int) -> Optional[tuple]:
+    rng = world.rng("populate")
+    for _ in range(PLACEMENT_ATTEMPTS):
+        tile = (center[0] + rng.randint(-radius, radius), center[1] + rng.randint(-radius, radius))
+        if world.is_open(tile):
+            return tile
+    return None
+
+
+def populate(world: World, villages: int, dragons: int, caravans: int, cattle: int) -> None:
+    """The demo settlements, then the requested extra population."""
+    rng = world.rng("populate")
+    populate_demo(world)
+    radius, profile = SITE_PROFILES["village"]
+    taken = [entity.coordinates for entity in world.entities if isinstance(entity, Settlement)]
+    sites = world.get_terrain_stats().score_sites(profile, radius, villages, 2 * radius, world.is_open, taken)
+    for i, site in enumerate(sites):
+        world.add_entity(Village(f"Village {i}", site.coordinates))
+
+    settlements = [entity for entity in world.entities if isinstance(entity, Settlement) and entity.is_alive]
+    spirits = [entity for entity in world.entities if isinstance(entity, Spirit)]
+    for i in range(dragons):
+        dragon = Dragon(f"Dragon {i}", DRAGON_KINDS[i % len(DRAGON_KINDS)],
+                        (rng.randrange(world.WIDTH), rng.randrange(world.HEIGHT)))
+        dragon.target = rng.choice(spirits or settlements)
+        dragon.state = "moving"
+        world.add_entity(dragon)
+
+    homes = [settlement for settlement in settlements if world.routes.entry(world, settlement) is not None]
+    if len(homes) > 1:
+        for _ in range(caravans):
+            home, destination = rng.sample(homes, 2)
+            world.add_entity(Caravan(world.routes.entry(world, home), destination, "trade", home))
+
+    pastures = [settlement for settlement in settlements if isinstance(settlement, (Village, City, Camp))]
+    for _ in range(cattle if pastures else 0):
+        tile = open_tile_near(world, rng.choice(pastures).coordinates, 10)
+        if tile is not None:
+            world.add_entity(Cattle(CATTLE_COLOR, tile, 30))
+
+
+def state_digest(world: World) -> str:
+    """Hash of every entity's serialized state, comparable across processes."""
+    state = json.dumps(world.get_changes().state, sort_keys=True, default=str)
+    return hashlib.sha256(state.encode()).hexdigest()[:16]
+
+
+def run_ticks(world: World, ticks: int, timer: Optional[PhaseTimer] = None,
+              recorder: Optional[Recorder] = None) -> None:
+    timer = timer or PhaseTimer()
+    for _ in range(ticks):
+        with timer.phase("entities"):
+            world._step()
+        with timer.phase("commit"):
+            world.commit_changes()
+        if recorder is not None:
+            with timer.phase("record"):
+                recorder.record(world)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--villages", type=int, default=0, help="extra villages at the best scoring sites")
+    parser.add_argument("--dragons", type=int, default=10)
+    parser.add_argument("--caravans", type=int, default=10)
+    parser.add_argument("--cattle", type=int, default=10)
+    parser.add_argument("--profile", metavar="OUT", help="write cProfile stats for the ticks to OUT")
+    parser.add_argument("--top", type=int, default=20, help="functions shown from the profile")
+    parser.add_argument("--tracemalloc", type=int, metavar="N", default=0, help="show the N top allocating lines")
+    parser.add_argument("--check-replay", action="store_true", help="rerun from the initial state and compare")
+    parser.add_argument("--record", metavar="OUT", help="record the ticks to a new file OUT")
+    args = parser.parse_args()
+
+    timer = PhaseTimer()
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    with timer.phase("terrain"):
+        height_map = HeightMapGenerator(args.seed).generate_height_map(World.WIDTH, World.HEIGHT)
+    with timer.phase("spirits"):
+        world = World(args.seed, height_map)
+    with timer.phase("populate"):
+        populate(world, args.villages, args.dragons, args.caravans, args.cattle)
+        world.get_changes()
+    initial = pickle.dumps(world) if args.check_replay else None
+    recorder = Recorder(world, args.record).attach(world) if args.record else None
+
+    counts = defaultdict(int)
+    for entity in world.entities:
+        counts[type(entity).__name__] += 1
+    print(f"World {args.seed}: " + ", ".join(f"{count} {name}" for name, count in sorted(counts.items())))
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    start = time.perf_counter()
+    run_ticks(world, args.ticks, timer, recorder)
+    elapsed = time.perf_counter() - start
+    if recorder is not None:
+        recorder.close()
+    if profiler:
+        profiler.disable()
+
+    print(f"{args.ticks} ticks in {elapsed:.2f}s: {args.ticks / elapsed:.1f} ticks/sec, "
+          f"{len(world.entities)} entities at the end, state {state_digest(world)}")
+    timer.report(args.ticks)
+    if recorder is not None:
+        print(f"recording writer {recorder.writer_seconds / args.ticks * 1000:.3f} ms/tick, "
+              f"{recorder.dropped_frames} frames dropped")
+
+    if profiler:
+        profiler.dump_stats(args.profile)
+        print(f"\nProfile written to {args.profile}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+
+    if args.tracemalloc:
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        print(f"Top {args.tracemalloc} allocating lines:")
+        for stat in snapshot.statistics("lineno")[:args.tracemalloc]:
+            print(f"  {stat}")
+
+    if initial is not None:
+        replay = pickle.loads(initial)
+        run_ticks(replay, args.ticks)
+        if state_digest(replay) != state_digest(world) or replay.update_count != world.update_count:
+            print(f"Replay diverged: state {state_digest(replay)} at tick {replay.update_count}")
+            sys.exit(1)
+        print(f"Replay from the initial state matches after {args.ticks} ticks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Dedicated simulation process for WORLD_MODE=shared.
+
+    python -m world.simulator &
+    WORLD_MODE=shared gunicorn -w 8 main:app
+
+The simulator builds the world the same way the app would (WORLD_SNAPSHOT,
+WORLD_SEED) and publishes every tick under WORLD_SHM_NAME. Only the entity
+state is published, so /api/stats is unavailable in shared mode and the
+simulator does not collect statistics at all.
+"""
+import os
+import signal
+import sys
+
+from world.demo import create_world
+from world.shared import DEFAULT_CAPACITY, DEFAULT_NAME, SharedWorldPublisher
+
+
+def main() -> None:
+    world = create_world(collect_stats=False)
+    world.idle_timeout = None  # Workers read from shared memory, so the simulator never sees them
+    publisher = SharedWorldPublisher(
+        world,
+        os.environ.get("WORLD_SHM_NAME", DEFAULT_NAME),
+        int(os.environ.get("WORLD_SHM_BYTES", DEFAULT_CAPACITY)),
+    )
+    # Turn SIGTERM into a normal exit so the segments get unlinked
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    world.tick_listeners.append(publisher.publish)
+    publisher.publish(world)
+    print(f"Simulating world {world.seed} with {len(world.entities)} entities")
+    try:
+        world.update_loop()
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Save and restore whole worlds, e.g. a world baked at build time."""
+import os
+import pickle
+import tempfile
+import time
+
+from world.world import World
+
+
+def save_world(world: World, path: str) -> None:
+    """Write the world atomically, so readers never see a partial file."""
+    world.get_changes()  # Make sure the change log has a committed state
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as file:
+        pickle.dump(world, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(file.name, path)
+
+
+def load_world(path: str, keep_clock: bool = False) -> World:
+    """Load a world written by save_world. Only load files you produced yourself.
+
+    By default the world carries on from now. With keep_clock, the time it
+    spent on disk counts as missed ticks, which the first reader fast-forwards.
+    """
+    with open(path, "rb") as file:
+        world = pickle.load(file)
+    if not isinstance(world, World):
+        raise TypeError(f"{path} does not contain a World")
+    if not keep_clock:
+        world.last_update_time = time.time()
+    return world
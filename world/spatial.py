@@ -0,0 +1,70 @@
+"""Uniform grid index of entity footprints for rectangle queries."""
+from collections import defaultdict
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+# (x0, y0, x1, y1), inclusive tile coordinates
+Bounds = Tuple[int, int, int, int]
+
+
+def footprint(data: Dict[str, Any]) -> Bounds:
+    """Bounding box of the tiles a serialized entity covers."""
+    tiles = [tile[0] for tile in data.get("tiles") or ()]
+    tiles.extend(data.get("domain_tiles") or ())
+    if not tiles:
+        x, y = data["coordinates"]
+        return (x, y, x, y)
+    xs = [tile[0] for tile in tiles]
+    ys = [tile[1] for tile in tiles]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def intersects(a: Optional[Bounds], b: Bounds) -> bool:
+    return a is not None and a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def expand(rect: Bounds, margin: int) -> Bounds:
+    return (rect[0] - margin, rect[1] - margin, rect[2] + margin, rect[3] + margin)
+
+
+class SpatialGrid:
+    """Buckets entity ids by the grid cells their bounds overlap."""
+
+    def __init__(self, cell_size: int = 16):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self.bounds: Dict[int, Bounds] = {}
+
+    def _cells(self, bounds: Bounds) -> Iterator[Tuple[int, int]]:
+        size = self.cell_size
+        for cy in range(bounds[1] // size, bounds[3] // size + 1):
+            for cx in range(bounds[0] // size, bounds[2] // size + 1):
+                yield (cx, cy)
+
+    def insert(self, entity_id: int, bounds: Bounds) -> None:
+        previous = self.bounds.get(entity_id)
+        if previous == bounds:
+            return
+        if previous is not None:
+            self.remove(entity_id)
+        self.bounds[entity_id] = bounds
+        for cell in self._cells(bounds):
+            self.cells[cell].add(entity_id)
+
+    def remove(self, entity_id: int) -> None:
+        bounds = self.bounds.pop(entity_id, None)
+        if bounds is None:
+            return
+        for cell in self._cells(bounds):
+            bucket = self.cells[cell]
+            bucket.discard(entity_id)
+            if not bucket:
+                del self.cells[cell]
+
+    def query(self, rect: Bounds) -> Set[int]:
+        """Ids of entities whose bounds intersect the rectangle."""
+        found: Set[int] = set()
+        for cell in self._cells(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return {entity_id for entity_id in found if intersects(self.bounds[entity_id], rect)}
@@ -0,0 +1,194 @@
+"""Time series of world statistics at fixed memory.
+
+Every tick the collector samples a few totals (SERIES) into a ring of
+recent ticks. The same sample is folded into the current minute bucket,
+and every closed minute into the current hour bucket. Each bucket keeps the
+mean, minimum and maximum of every series. All rings are preallocated
+arrays, so appends are O(1) and memory stays fixed however long the world
+runs: 8 bytes for each series' mean, min and max and the start time, per
+slot, which is about 640 KB per world with the default RESOLUTIONS.
+"""
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence
+
+from entities.base.settlement import Settlement
+from entities.caravan import Caravan
+from entities.dragon import Dragon
+from entities.spirit import Spirit
+from world.world import World
+
+SERIES = ("entities", "dragons", "caravans", "spirit_life", "settlement_life", "tick_ms")
+
+# name -> (bucket seconds, slots); ticks are kept as they come
+RESOLUTIONS = {
+    "tick": (None, 600),
+    "minute": (60, 1440),  # A day
+    "hour": (3600, 24 * 90),  # A quarter
+}
+
+
+class Ring:
+    """The last `capacity` buckets: start time, then mean, min and max of each series."""
+
+    def __init__(self, capacity: int, width: int):
+        self.capacity = capacity
+        self.width = width
+        self.times = array("d", bytes(8 * capacity))
+        self.means = [array("d", bytes(8 * capacity)) for _ in range(width)]
+        self.mins = [array("d", bytes(8 * capacity)) for _ in range(width)]
+        self.maxes = [array("d", bytes(8 * capacity)) for _ in range(width)]
+        self.count = 0  # Buckets ever appended
+
+    def append(self, start: float, means: Sequence[float], mins: Sequence[float], maxes: Sequence[float]) -> None:
+        slot = self.count % self.capacity
+        self.times[slot] = start
+        for i in range(self.width):
+            self.means[i][slot] = means[i]
+            self.mins[i][slot] = mins[i]
+            self.maxes[i][slot] = maxes[i]
+        self.count += 1
+
+    def slots(self, start: float, end: float) -> List[int]:
+        """Slots of the buckets starting in [start, end], oldest first."""
+        oldest = max(0, self.count - self.capacity)
+        # Start times only grow, so search by age rather than by slot
+        times = _Ordered(self, oldest)
+        first = oldest + bisect_left(times, start)
+        last = oldest + bisect_right(times, end)
+        return [index % self.capacity for index in range(first, last)]
+
+
+class _Ordered:
+    """A ring's start times in age order, for bisect."""
+
+    def __init__(self, ring: Ring, oldest: int):
+        self.ring = ring
+        self.oldest = oldest
+
+    def __len__(self) -> int:
+        return self.ring.count - self.oldest
+
+    def __getitem__(self, index: int) -> float:
+        return self.ring.times[(self.oldest + index) % self.ring.capacity]
+
+
+class Bucket:
+    """Running aggregate of the bucket being filled."""
+
+    def __init__(self, start: float, width: int):
+        self.start = start
+        self.samples = 0
+        self.sums = [0.0] * width
+        self.mins = [math.inf] * width
+        self.maxes = [-math.inf] * width
+
+    def add(self, sums: Sequence[float], samples: int, mins: Sequence[float], maxes: Sequence[float]) -> None:
+        self.samples += samples
+        for i, value in enumerate(sums):
+            self.sums[i] += value
+            if mins[i] < self.mins[i]:
+                self.mins[i] = mins[i]
+            if maxes[i] > self.maxes[i]:
+                self.maxes[i] = maxes[i]
+
+    def means(self) -> List[float]:
+        return [total / self.samples for total in self.sums]
+
+
+class WorldStats:
+    """Tick listener keeping SERIES at every resolution in RESOLUTIONS."""
+
+    def __init__(self, resolutions: Dict[str, tuple] = RESOLUTIONS):
+        self.levels = list(resolutions)
+        self.periods = {name: period for name, (period, _) in resolutions.items()}
+        self.rings = {name: Ring(slots, len(SERIES)) for name, (_, slots) in resolutions.items()}
+        self._pending: Dict[str, Optional[Bucket]] = {name: None for name in self.levels[1:]}
+        self._lock = threading.Lock()
+
+    def attach(self, world) -> "WorldStats":
+        world.tick_listeners.append(self.record)
+        return self
+
+    @staticmethod
+    def sample(world) -> List[float]:
+        dragons = caravans = spirit_life = settlement_life = 0
+        for entity in world.entities:
+            if isinstance(entity, Spirit):
+                spirit_life += entity.life
+            elif isinstance(entity, Dragon):
+                dragons += 1
+            elif isinstance(entity, Caravan):
+                caravans += 1
+            elif isinstance(entity, Settlement) and entity.is_alive:
+                settlement_life += entity.life
+        return [len(world.entities), dragons, caravans, spirit_life, settlement_life, world.last_tick_seconds * 1000]
+
+    def record(self, world, now: Optional[float] = None) -> None:
+        """Tick listener: add this tick's sample to every resolution."""
+        values = self.sample(world)
+        now = time.time() if now is None else now
+        with self._lock:
+            self.rings[self.levels[0]].append(now, values, values, values)
+            self._fold(1, now, values, 1, values, values)
+
+    def _fold(self, level: int, now: float, sums, samples: int, mins, maxes) -> None:
+        if level >= len(self.levels):
+            return
+        name = self.levels[level]
+        period = self.periods[name]
+        start = now // period * period
+        bucket = self._pending[name]
+        if bucket is not None and bucket.start != start:
+            # The bucket is complete: store it and pass it up a level
+            self.rings[name].append(bucket.start, bucket.means(), bucket.mins, bucket.maxes)
+            self._fold(level + 1, bucket.start, bucket.sums, bucket.samples, bucket.mins, bucket.maxes)
+            bucket = None
+        if bucket is None:
+            bucket = self._pending[name] = Bucket(start, len(SERIES))
+        bucket.add(sums, samples, mins, maxes)
+
+    def query(self, resolution: str, start: float = -math.inf, end: float = math.inf,
+              series: Sequence[str] = SERIES) -> Dict[str, object]:
+        """Buckets starting in [start, end], including the one still being filled."""
+        columns = [SERIES.index(name) for name in series]
+        with self._lock:
+            ring = self.rings[resolution]
+            slots = ring.slots(start, end)
+            times = [ring.times[slot] for slot in slots]
+            result = {
+                name: {
+                    "mean": [ring.means[i][slot] for slot in slots],
+                    "min": [ring.mins[i][slot] for slot in slots],
+                    "max": [ring.maxes[i][slot] for slot in slots],
+                }
+                for name, i in zip(series, columns)
+            }
+            bucket = self._pending.get(resolution)
+            if bucket is not None and start <= bucket.start <= end:
+                times.append(bucket.start)
+                means = bucket.means()
+                for name, i in zip(series, columns):
+                    result[name]["mean"].append(means[i])
+                    result[name]["min"].append(bucket.mins[i])
+                    result[name]["max"].append(bucket.maxes[i])
+        return {"resolution": resolution, "period": self.periods[resolution], "times": times, "series": result}
+
+
+_lock = threading.Lock()
+
+
+def get_stats(world) -> Optional[WorldStats]:
+    """The world's collector, attaching one on first use.
+
+    None unless `world` is a World simulated in this process: a
+    SharedWorldView has tick listeners but no entities to sample.
+    """
+    with _lock:
+        stats = getattr(world, "stats", None)
+        if stats is None and isinstance(world, World):
+            stats = world.stats = WorldStats().attach(world)
+        return stats
@@ -0,0 +1,60 @@
+"""Compact binary encodings of the heightmap for transport to clients."""
+import sys
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+# Biome codes used by the "biome" format, in threshold order
+BIOMES = ("water", "field", "forest", "mountain")
+
+# format -> (array typecode, quantization scale); scale None means biome codes
+FORMATS = {
+    "u8": ("B", 255),
+    "u16": ("H", 65535),
+    "biome": ("B", None),
+}
+
+# (x, y, width, height)
+Region = Tuple[int, int, int, int]
+
+
+def clamp_region(region: Optional[Region], width: int, height: int) -> Region:
+    """Clip a requested region to the map; None selects the whole map."""
+    if region is None:
+        return (0, 0, width, height)
+    x, y, w, h = region
+    x = min(max(0, x), width)
+    y = min(max(0, y), height)
+    return (x, y, max(0, min(w, width - x)), max(0, min(h, height - y)))
+
+
+def encode_terrain(world, fmt: str, region: Region) -> bytes:
+    """Row-major little-endian samples of the region in the requested format."""
+    typecode, scale = FORMATS[fmt]
+    x, y, w, h = region
+    rows: List[List[float]] = [row[x:x + w] for row in world.height_map[y:y + h]]
+
+    if scale is None:
+        biome_codes = {biome: code for code, biome in enumerate(BIOMES)}
+        samples = array(typecode, (biome_codes[world.get_biome_from_height(v)] for row in rows for v in row))
+    else:
+        samples = array(typecode, (int(v * scale + 0.5) for row in rows for v in row))
+
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def encode_cells(heights: Sequence[float], biomes: bytes, width: int, fmt: str, region: Region) -> bytes:
+    """Like encode_terrain, for a row-major grid with its own biome codes, e.g. a pyramid level."""
+    typecode, scale = FORMATS[fmt]
+    x, y, w, h = region
+    rows = range(y * width + x, (y + h) * width + x, width)
+
+    if scale is None:
+        samples = array(typecode, b"".join(biomes[start:start + w] for start in rows))
+    else:
+        samples = array(typecode, (int(v * scale + 0.5) for start in rows for v in heights[start:start + w]))
+
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tobytes()
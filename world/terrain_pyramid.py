@@ -0,0 +1,86 @@
+"""Mip pyramid of the heightmap for zoomed-out views.
+
+Level 0 is the map itself; each further level halves both sides, so a cell
+of level L covers up to 2**L x 2**L tiles. Heights are the mean of the
+tiles a cell covers. Biomes are the dominant biome of those tiles, not the
+biome of the mean height, so a lake or a ridge wider than a cell stays
+visible at any level. Exact dominance needs the tile counts per biome,
+which are summed level by level and dropped once the level is built.
+"""
+from array import array
+from typing import Callable, List, NamedTuple, Sequence
+
+from world.terrain_codec import BIOMES, Region, clamp_region
+
+MIN_SIZE = 8  # Coarsest level has at least this many cells across
+
+
+class Level(NamedTuple):
+    cell: int  # Tiles per cell side
+    width: int
+    height: int
+    heights: array  # Row-major mean heights, "d"
+    biomes: bytes  # Row-major dominant biome codes, see BIOMES
+
+
+class TerrainPyramid:
+
+    def __init__(self, height_map: Sequence[Sequence[float]], biome_of: Callable[[float], str]):
+        height = len(height_map)
+        width = len(height_map[0]) if height_map else 0
+        codes = {biome: code for code, biome in enumerate(BIOMES)}
+        heights = array("d", (value for row in height_map for value in row))
+        biomes = bytes(codes[biome_of(value)] for row in height_map for value in row)
+        # Tile counts per biome for every cell, flattened as cell * len(BIOMES) + code
+        counts = array("I", bytes(4 * len(BIOMES) * width * height))
+        for i, code in enumerate(biomes):
+            counts[i * len(BIOMES) + code] = 1
+        tiles = array("I", [1]) * (width * height)
+
+        self.levels: List[Level] = [Level(1, width, height, heights, biomes)]
+        while max(width, height) > MIN_SIZE:
+            width, height, heights, counts, tiles = self._halve(width, height, heights, counts, tiles)
+            biomes = bytes(self._dominant(counts, i) for i in range(width * height))
+            self.levels.append(Level(self.levels[-1].cell * 2, width, height, heights, biomes))
+
+    @staticmethod
+    def _halve(width: int, height: int, heights: array, counts: array, tiles: array):
+        """Merge 2x2 blocks of cells, weighting heights by the tiles each cell covers."""
+        kinds = len(BIOMES)
+        half_width, half_height = (width + 1) // 2, (height + 1) // 2
+        merged_heights = array("d", bytes(8 * half_width * half_height))
+        merged_counts = array("I", bytes(4 * kinds * half_width * half_height))
+        merged_tiles = array("I", bytes(4 * half_width * half_height))
+        for y in range(height):
+            for x in range(width):
+                source = y * width + x
+                target = (y // 2) * half_width + x // 2
+                merged_heights[target] += heights[source] * tiles[source]
+                merged_tiles[target] += tiles[source]
+                for code in range(kinds):
+                    merged_counts[target * kinds + code] += counts[source * kinds + code]
+        for i, covered in enumerate(merged_tiles):
+            merged_heights[i] /= covered
+        return half_width, half_height, merged_heights, merged_counts, merged_tiles
+
+    @staticmethod
+    def _dominant(counts: array, cell: int) -> int:
+        """Most common biome of a cell; ties go to the one earliest in BIOMES."""
+        kinds = len(BIOMES)
+        cell_counts = counts[cell * kinds:(cell + 1) * kinds]
+        return max(range(kinds), key=lambda code: (cell_counts[code], -code))
+
+    def level_for(self, tiles_per_cell: float) -> int:
+        """Coarsest level whose cells are no larger than `tiles_per_cell` tiles."""
+        level = 0
+        while level + 1 < len(self.levels) and self.levels[level + 1].cell <= tiles_per_cell:
+            level += 1
+        return level
+
+    def region(self, level: int, tiles: Region) -> Region:
+        """The cells of `level` that cover a region given in tiles."""
+        cell = self.levels[level].cell
+        x, y, w, h = tiles
+        x0, y0 = x // cell, y // cell
+        x1, y1 = -(-(x + w) // cell), -(-(y + h) // cell)
+        return clamp_region((x0, y0, x1 - x0, y1 - y0), self.levels[level].width, self.levels[level].height)
@@ -0,0 +1,119 @@
+"""Biome counts over any rectangle in O(1), and site scoring built on them.
+
+For each biome, a summed-area table holds at (x, y) the number of tiles of
+that biome above and left of (x, y). The count in any rectangle is then
+four lookups. score_sites() slides a window over every tile a row at a
+time, so ranking the whole map costs a few list operations per row and
+biome. The tables take 4 bytes per tile and biome.
+"""
+from array import array
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from entities.base.entity import Coordinates
+from world.terrain_codec import BIOMES
+
+# settlement type -> (radius, {biome: (weight, wanted share of the window)})
+SITE_PROFILES = {
+    "camp": (4, {"mountain": (1.0, 0.3), "forest": (0.5, 0.2), "field": (0.5, 0.3)}),
+    "village": (5, {"field": (1.0, 0.5), "water": (0.8, 0.15), "forest": (0.4, 0.15)}),
+    "city": (8, {"field": (1.0, 0.6), "water": (1.0, 0.1), "forest": (0.3, 0.1)}),
+}
+
+
+class Site(NamedTuple):
+    coordinates: Coordinates
+    score: float
+
+
+class TerrainStats:
+
+    def __init__(self, height_map: Sequence[Sequence[float]], biome_of: Callable[[float], str]):
+        self.height = len(height_map)
+        self.width = len(height_map[0]) if height_map else 0
+        self.stride = self.width + 1
+        self.tables: Dict[str, array] = {}
+        biomes = [[biome_of(value) for value in row] for row in height_map]
+        for biome in BIOMES:
+            table = array("i", bytes(4 * self.stride * (self.height + 1)))
+            above = 0
+            for y, row in enumerate(biomes):
+                offset = (y + 1) * self.stride
+                running = 0
+                for x, tile in enumerate(row):
+                    running += tile == biome
+                    table[offset + x + 1] = table[above + x + 1] + running
+                above = offset
+            self.tables[biome] = table
+
+    def count(self, biome: str, x0: int, y0: int, x1: int, y1: int) -> int:
+        """Tiles of `biome` with x0 <= x < x1 and y0 <= y < y1, clipped to the map."""
+        x0, x1 = max(0, x0), min(self.width, x1)
+        y0, y1 = max(0, y0), min(self.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return 0
+        table, stride = self.tables[biome], self.stride
+        return (table[y1 * stride + x1] - table[y0 * stride + x1]
+                - table[y1 * stride + x0] + table[y0 * stride + x0])
+
+    def counts(self, coordinates: Coordinates, radius: int) -> Dict[str, int]:
+        """Tiles of each biome within `radius` (a square) of `coordinates`."""
+        x, y = coordinates
+        return {biome: self.count(biome, x - radius, y - radius, x + radius + 1, y + radius + 1) for biome in BIOMES}
+
+    def score_map(self, profile: Dict[str, Tuple[float, float]], radius: int) -> List[List[float]]:
+        """Score every tile by the biomes in the window of `radius` around it.
+
+        Each biome adds its weight times the share of the window it covers,
+        divided by the share wanted and capped at 1, so a site needs some
+        of everything rather than the most of one biome. Scores are
+        normalised by the positive weights. Tiles off the map count as
+        nothing, which penalises sites at the edge.
+        """
+        width, stride = self.width, self.stride
+        lows = [max(0, x - radius) for x in range(width)]
+        highs = [min(width, x + radius + 1) for x in range(width)]
+        area = (2 * radius + 1) ** 2
+        total_weight = sum(weight for weight, _ in profile.values() if weight > 0) or 1.0
+
+        scores = []
+        for y in range(self.height):
+            y0, y1 = max(0, y - radius), min(self.height, y + radius + 1)
+            row = [0.0] * width
+            for biome, (weight, share) in profile.items():
+                table = self.tables[biome]
+                wanted = area * share
+                # Column totals of the band y0..y1, then window differences along x
+                band = [bottom - top for top, bottom in zip(table[y0 * stride:(y0 + 1) * stride],
+                                                            table[y1 * stride:(y1 + 1) * stride])]
+                row = [
+                    total + weight * min(1.0, (band[high] - band[low]) / wanted)
+                    for total, low, high in zip(row, lows, highs)
+                ]
+            scores.append([total / total_weight for total in row])
+        return scores
+
+    def score_sites(self, profile: Dict[str, Tuple[float, float]], radius: int, limit: int = 10, spacing: int = 0,
+                    allowed: Optional[Callable[[Coordinates], bool]] = None,
+                    taken: Iterable[Coordinates] = ()) -> List[Site]:
+        """The best `limit` tiles by score, at least `spacing` tiles apart and from `taken`.
+
+        `allowed` filters candidate centres, e.g. to open field tiles.
+        """
+        scores = self.score_map(profile, radius)
+        ranked = sorted(
+            ((score, (x, y)) for y, row in enumerate(scores) for x, score in enumerate(row)),
+            reverse=True,
+        )
+        chosen: List[Site] = []
+        occupied: Set[Coordinates] = set(taken)
+        for score, tile in ranked:
+            if len(chosen) >= limit:
+                break
+            if allowed is not None and not allowed(tile):
+                continue
+            if spacing and any(max(abs(tile[0] - x), abs(tile[1] - y)) < spacing for x, y in occupied):
+                continue
+            chosen.append(Site(tile, round(score, 4)))
+            occupied.add(tile)
+        return chosen
+
@@ -1,9 +1,17 @@
+import math
 import random
 import threading
 import time
-from typing import List
+from typing import Callable, Dict, List, Optional, Set
+from entities.base.named import Named
+from entities.base.settlement import Settlement
 from world import HeightMapGenerator
+from world.changelog import ChangeLog
 from world.entity_gen import generate_spirits
+from world.routes import RouteNetwork, is_open
+from world.scheduler import Scheduler
+from world.terrain_pyramid import TerrainPyramid
+from world.terrain_stats import TerrainStats
 
 class World:
 
@@ -16,21 +24,69 @@ class World:
         'forest': 0.80,
     }
 
-    def __init__(self, seed=None):
+    CHANGE_HISTORY = 120  # ticks of changes kept for delta queries
+    IDLE_TIMEOUT = 60.0  # seconds without readers before ticking stops
+    CATCH_UP_BUDGET = 0.25  # seconds a returning reader may wait for missed ticks
+
+    def __init__(self, seed=None, height_map=None):
         if seed is None:
             seed = random.randint(0, 1000000)
         self.seed = seed
-        self.height_map = HeightMapGenerator(seed).generate_height_map(self.WIDTH, self.HEIGHT)
+        # Terrain depends only on the seed, so worlds with the same seed may share one
+        if height_map is None:
+            height_map = HeightMapGenerator(seed).generate_height_map(self.WIDTH, self.HEIGHT)
+        self.height_map = height_map
         
         # Entity management
         self.entities: List = []
         self.update_interval = 1  # seconds
         self.last_update_time = time.time()
         self.update_count = 0
+        self.idle_timeout: Optional[float] = self.IDLE_TIMEOUT  # None keeps ticking without readers
+        self.catch_up_budget = self.CATCH_UP_BUDGET
+        self.last_read_time = time.time()
+        self.suspended = False
+        self.catching_up = False  # Set during fast_forward(), see Entity.next_wake()
+        self.last_tick_seconds = 0.0  # Duration of the latest tick, averaged over a fast-forward
+        self._tick_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._next_entity_id = 1
+        self.entities_by_id = {}
+        self.entities_by_name: Dict[str, Named] = {}  # Lowercased name -> first live entity with it
+        self._dirty_ids: Set[int] = set()  # Entities whose serialization changed since the last commit
+        self._removed_ids: Set[int] = set()
+        self.changes = ChangeLog(self.CHANGE_HISTORY)
+        self.scheduler = Scheduler(self.entities_by_id)
+        self.scheduled = True  # False updates every entity every tick, for comparison
+        self.routes = RouteNetwork()  # Kept in snapshots, so warm starts keep the routes planned so far
+        self.tick_listeners: List[Callable[["World"], None]] = []  # Called after every tick
+        self.rngs: Dict[str, random.Random] = {}  # Stream name -> generator, see rng()
         
         # Generate spirits after heightmap is ready
         generate_spirits(self)
 
+    def __getstate__(self):
+        # Listeners belong to the running server, not to the world's state
+        state = self.__dict__.copy()
+        state["tick_listeners"] = []
+        state.pop("broadcaster", None)
+        state.pop("recorder", None)
+        state.pop("stats", None)
+        state.pop("terrain_stats", None)  # Rebuilt from the heightmap when needed
+        state.pop("terrain_pyramid", None)
+        state.pop("responses", None)
+        state.pop("_tick_lock", None)
+        state.pop("_stopped", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("rngs", {})
+        self.__dict__.setdefault("last_tick_seconds", 0.0)
+        self._tick_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.last_read_time = time.time()
+
     @staticmethod
     def get_biome_from_height(height):
         if height < World.THRESHOLDS['water']:
@@ -41,16 +97,84 @@ class World:
             return 'forest'
         return 'mountain'
 
+    def rng(self, stream: str) -> random.Random:
+        """This world's random generator for one subsystem, seeded from the world seed.
+
+        Entities draw from these instead of the global `random` module, so
+        the seed, the initial state and the number of ticks determine the
+        world exactly. Streams are pickled with the world, and a subsystem's
+        draws never shift another's.
+        """
+        generator = self.rngs.get(stream)
+        if generator is None:
+            generator = self.rngs[stream] = random.Random(f"{self.seed}:{stream}")
+        return generator
+
+    def get_terrain_stats(self) -> TerrainStats:
+        """Per-biome summed-area tables of the terrain, built on first use."""
+        stats = getattr(self, "terrain_stats", None)
+        if stats is None:
+            stats = self.terrain_stats = TerrainStats(self.height_map, self.get_biome_from_height)
+        return stats
+
+    def get_terrain_pyramid(self) -> TerrainPyramid:
+        """Downsampled levels of the terrain for zoomed-out views, built on first use."""
+        pyramid = getattr(self, "terrain_pyramid", None)
+        if pyramid is None:
+            pyramid = self.terrain_pyramid = TerrainPyramid(self.height_map, self.get_biome_from_height)
+        return pyramid
+
+    def is_open(self, coordinates) -> bool:
+        """An in-bounds field tile with no settlement on it."""
+        self.routes.refresh(self)
+        return is_open(self, coordinates, self.routes.blocked)
+
     
 
     def add_entity(self, entity) -> None:
         """Add an entity to the world."""
+        if entity.id is None:
+            entity.id = self._next_entity_id
+            self._next_entity_id += 1
         self.entities.append(entity)
+        self.entities_by_id[entity.id] = entity
+        if isinstance(entity, Named):
+            self.entities_by_name.setdefault(entity.name.lower(), entity)
+        self._removed_ids.discard(entity.id)
+        entity._dirty_sink = self._dirty_ids
+        entity.mark_dirty()
+        self.scheduler.add(entity)
+        if isinstance(entity, Settlement):
+            self.routes.invalidate()
     
     def remove_entity(self, entity) -> None:
         """Remove an entity from the world."""
         if entity in self.entities:
             self.entities.remove(entity)
+            self.entities_by_id.pop(entity.id, None)
+            if isinstance(entity, Named) and self.entities_by_name.get(entity.name.lower()) is entity:
+                del self.entities_by_name[entity.name.lower()]
+            entity._dirty_sink = None
+            self._removed_ids.add(entity.id)
+            self.scheduler.remove(entity)
+            if isinstance(entity, Settlement):
+                self.routes.invalidate()
+
+    def promote_settlement(self, village) -> Settlement:
+        """Replace a village with the city it grows into, keeping its id and place."""
+        city = village.promote_to_city()
+        city.id = village.id
+        self.entities[self.entities.index(village)] = city
+        self.entities_by_id[city.id] = city
+        if self.entities_by_name.get(village.name.lower()) is village:
+            self.entities_by_name[village.name.lower()] = city
+        village._dirty_sink = None
+        self.scheduler.remove(village)
+        city._dirty_sink = self._dirty_ids
+        city.mark_dirty()
+        self.scheduler.add(city)
+        self.routes.invalidate()
+        return city
     
     def get_entities_at(self, coordinates):
         """Get all entities at a specific coordinate."""
@@ -61,20 +185,98 @@ class World:
         current_time = time.time()
         return current_time - self.last_update_time >= self.update_interval
     
+    def touch(self) -> None:
+        """Note that a reader wants the world; a suspended world resumes on the next update."""
+        self.last_read_time = time.time()
+        self.suspended = False
+
     def update(self) -> None:
-        """Update all entities and advance game state."""
-        if not self.should_update():
-            return
-        
-        self.last_update_time = time.time()
+        """Bring the world up to date for a reader, within the catch-up budget."""
+        self.touch()
+        self.advance(self.catch_up_budget)
+
+    def advance(self, budget: Optional[float] = None) -> None:
+        """Run the ticks that are due: normally one, many after a suspension."""
+        with self._tick_lock:
+            missed = int((time.time() - self.last_update_time) // self.update_interval)
+            if missed == 1:
+                self.last_update_time = time.time()
+                self.tick()
+            elif missed > 1:
+                done = self.fast_forward(missed, budget)
+                # Keep the tick phase; whatever is left over is still due next time
+                self.last_update_time += done * self.update_interval
+
+    def tick(self) -> None:
+        """Advance one tick and publish it."""
+        start = time.perf_counter()
+        self._step()
+        self.commit_changes()
+        self.last_tick_seconds = time.perf_counter() - start
+        for listener in self.tick_listeners:
+            listener(self)
+
+    def fast_forward(self, ticks: int, budget: Optional[float] = None) -> int:
+        """Advance up to `ticks` ticks and publish them as one change.
+
+        Stops early once `budget` seconds are spent and returns the number of
+        ticks run. Nothing is published in between, so entities may sleep
+        through ticks that change what they serialize and catch up in closed
+        form (see Entity.next_wake); the rest are stepped as usual.
+        """
+        start = time.perf_counter()
+        deadline = start + budget if budget is not None else math.inf
+        done = 0
+        self.catching_up = True
+        try:
+            while done < ticks:
+                self._step()
+                done += 1
+                if time.perf_counter() > deadline:
+                    break
+        finally:
+            self.catching_up = False
+            if self.scheduled:
+                self.scheduler.catch_up()
+        self.commit_changes()
+        self.last_tick_seconds = (time.perf_counter() - start) / max(1, done)
+        for listener in self.tick_listeners:
+            listener(self)
+        return done
+
+    def _step(self) -> None:
+        """Run one tick's entity updates, only for the entities with work due."""
         self.update_count += 1
-        
-        for entity in self.entities:
+
+        if self.scheduled:
+            due = self.scheduler.run(self.update_count)
+        else:
+            due = list(self.entities)
+        for entity in due:
             entity.update(self)
             # Check for dead camps
             if hasattr(entity, 'settlement_type') and entity.settlement_type == 'worker_camp':
                 if entity.is_dead:
                     self.remove_entity(entity)
+                    continue
+            if self.scheduled:
+                self.scheduler.reschedule(entity, self)
+
+    def get_changes(self) -> ChangeLog:
+        """Get the change log, recording the current state if nothing was committed yet."""
+        if self.changes.tick is None:
+            self.commit_changes()
+        return self.changes
+
+    def commit_changes(self) -> None:
+        """Record the entities that changed since the last commit under the current tick."""
+        updated = {
+            entity_id: self.entities_by_id[entity_id].serialize()
+            for entity_id in self._dirty_ids if entity_id in self.entities_by_id
+        }
+        self._dirty_ids.clear()
+        self.changes.commit_changes(self.update_count, updated, self._removed_ids)
+        self._removed_ids.clear()
     
     def get_next_update_time(self) -> float:
         """Get seconds until next update."""
@@ -84,17 +286,25 @@ class World:
 
     # Background world update thread
     def update_loop(self) -> None:
-        """Continuously update the world in the background."""
-        while True:
+        """Continuously update the world in the background, pausing while nobody reads it."""
+        while not self._stopped.is_set():
             try:
-                self.update()
+                if self.idle_timeout is not None and time.time() - self.last_read_time > self.idle_timeout:
+                    self.suspended = True
+                if not self.suspended:
+                    self.advance(self.catch_up_budget)
                 # Sleep for a short time to avoid busy-waiting
-                time.sleep(0.5)  # Check for updates twice per second
+                self._stopped.wait(0.5)  # Check for updates twice per second
             except Exception as e:
                 print(f"Error in world update loop: {e}")
-                time.sleep(1)
+                self._stopped.wait(1)
 
     def start_update_thread(self) -> None:
         # Start background thread
+        self._stopped.clear()
         update_thread = threading.Thread(target=self.update_loop, daemon=True)
-        update_thread.start()
\ No newline at end of file
+        update_thread.start()
+
+    def stop_update_thread(self) -> None:
+        """Stop the background thread after its current pass, e.g. before unloading the world."""
+        self._stopped.set()
\ No newline at end of file